@@ -4,10 +4,54 @@ Interactive chat with Smart Buddy AI Agent
 Powered by Google Gemini SDK
 """
 import sys
-from smart_buddy.agents.general_agent import GeneralAgent
-from smart_buddy.agents.mentor import MentorAgent
-from smart_buddy.agents.bestfriend import BestFriendAgent
-from smart_buddy.memory import MemoryBank
+from functools import lru_cache
+
+MODE_NAMES = {
+    'general': '🤖 GENERAL MODE',
+    'mentor': '🎓 MENTOR MODE',
+    'bestfriend': '💕 BESTFRIEND MODE'
+}
+
+@lru_cache(maxsize=None)
+def get_memory():
+    """Open the shared MemoryBank on first use"""
+    from smart_buddy.memory import MemoryBank
+    return MemoryBank()
+
+@lru_cache(maxsize=None)
+def get_agent(mode):
+    """Build the agent for `mode` on first use and reuse it afterwards.
+
+    Agent modules are imported here so modes the user never picks cost nothing.
+    """
+    if mode == 'general':
+        from smart_buddy.agents.general_agent import GeneralAgent
+        return GeneralAgent(memory=get_memory())
+    if mode == 'mentor':
+        from smart_buddy.agents.mentor import MentorAgent
+        return MentorAgent(memory=get_memory())
+    if mode == 'bestfriend':
+        from smart_buddy.agents.bestfriend import BestFriendAgent
+        return BestFriendAgent()
+    raise ValueError(f"Unknown mode: {mode}")
+
+@lru_cache(maxsize=None)
+def _line_reader():
+    """Pick the line reader once: prompt_toolkit with history, else readline-backed input()"""
+    try:
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.history import FileHistory
+    except ImportError:
+        try:
+            import readline  # noqa: F401 - gives input() line editing and history
+        except ImportError:
+            pass
+        return input
+    return PromptSession(history=FileHistory(".smart_buddy_history")).prompt
+
+def _read_line(prompt):
+    """Blocking read of one line of user input"""
+    return _line_reader()(prompt)
 
 def display_modes():
     """Display available modes"""
@@ -29,7 +73,7 @@ def select_mode():
     """Let user select a mode"""
     while True:
         print("\nSelect a mode (1-3) or 'q' to quit:")
-        choice = input("Your choice: ").strip().lower()
+        choice = _read_line("Your choice: ").strip().lower()
         
         if choice == 'q':
             return None
@@ -42,27 +86,29 @@ def select_mode():
         else:
             print("❌ Invalid choice. Please enter 1, 2, 3, or 'q'")
 
+def stream_reply(chunks):
+    """Print reply chunks as soon as the agent yields them"""
+    print("\n🤖 Smart Buddy: ", end="", flush=True)
+    for chunk in chunks:
+        sys.stdout.write(chunk)
+        sys.stdout.flush()
+    print("\n")
+
 def main():
     print("=" * 60)
     print("  Smart Buddy AI Agent - Interactive Chat")
     print("  Powered by Google Gemini 2.5 Flash")
     print("=" * 60)
     
-    # Initialize memory and agents
-    memory = MemoryBank()
-    general_agent = GeneralAgent(memory=memory)
-    mentor_agent = MentorAgent(memory=memory)
-    bestfriend_agent = BestFriendAgent()
-    
     # Get user name
-    user_id = input("\nEnter your name (or press Enter for 'User'): ").strip() or "User"
+    user_id = _read_line("\nEnter your name (or press Enter for 'User'): ").strip() or "User"
     session_id = "interactive_session"
     
     print(f"\nHello {user_id}! Welcome to Smart Buddy!")
     
-    # Main loop
-    current_mode = None
-    print(f"\nHello {user_id}! Welcome to Smart Buddy!")
+    # Envelope parts that stay fixed for the session (payload) or the mode (meta)
+    payload_base = {'user_id': user_id, 'session_id': session_id}
+    meta = None
     
     # Main loop
     current_mode = None
@@ -78,18 +124,15 @@ def main():
                     print("\nGoodbye! 👋 Thanks for using Smart Buddy!")
                     break
                 
+                meta = {'from': 'user', 'to': current_mode, 'trace_id': f'{session_id}_{current_mode}'}
+                
                 # Display mode-specific welcome
-                mode_names = {
-                    'general': '🤖 GENERAL MODE',
-                    'mentor': '🎓 MENTOR MODE',
-                    'bestfriend': '💕 BESTFRIEND MODE'
-                }
-                print(f"\n✓ Switched to {mode_names[current_mode]}")
+                print(f"\n✓ Switched to {MODE_NAMES[current_mode]}")
                 print("Commands: 'switch' to change mode, 'exit' to quit\n")
             
             # Get user input
             try:
-                user_input = input(f"{user_id}: ").strip()
+                user_input = _read_line(f"{user_id}: ").strip()
             except EOFError:
                 print("\n\nGoodbye! 👋")
                 break
@@ -108,43 +151,15 @@ def main():
             
             # Process based on selected mode
             try:
-                result = None
-                
-                if current_mode == 'general':
-                    # Create envelope for general agent
-                    envelope = {
-                        'meta': {'from': 'user', 'to': 'general', 'trace_id': f'{session_id}_{current_mode}'},
-                        'payload': {
-                            'user_id': user_id,
-                            'session_id': session_id,
-                            'text': user_input
-                        }
-                    }
-                    result = general_agent.handle(envelope)
+                envelope = {'meta': meta, 'payload': {**payload_base, 'text': user_input}}
+                agent = get_agent(current_mode)
                 
-                elif current_mode == 'mentor':
-                    # Create envelope for mentor agent
-                    envelope = {
-                        'meta': {'from': 'user', 'to': 'mentor', 'trace_id': f'{session_id}_{current_mode}'},
-                        'payload': {
-                            'user_id': user_id,
-                            'session_id': session_id,
-                            'text': user_input
-                        }
-                    }
-                    result = mentor_agent.handle(envelope)
+                # General and mentor replies are printed as they stream in
+                if hasattr(agent, 'handle_stream'):
+                    stream_reply(agent.handle_stream(envelope))
+                    continue
                 
-                elif current_mode == 'bestfriend':
-                    # Create envelope for bestfriend agent
-                    envelope = {
-                        'meta': {'from': 'user', 'to': 'bestfriend', 'trace_id': f'{session_id}_{current_mode}'},
-                        'payload': {
-                            'user_id': user_id,
-                            'session_id': session_id,
-                            'text': user_input
-                        }
-                    }
-                    result = bestfriend_agent.handle(envelope)
+                result = agent.handle(envelope)
                 
                 # Display response
                 if result:
@@ -181,9 +196,10 @@ def main():
         print("\n\nGoodbye! 👋")
     
     finally:
-        # Close memory connection
+        # Close memory connection if any agent opened it
         try:
-            memory.close()
+            if get_memory.cache_info().currsize:
+                get_memory().close()
         except:
             pass
 
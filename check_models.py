@@ -1,23 +1,74 @@
 #!/usr/bin/env python3
-"""Check available Google AI models."""
+"""Check available Google AI models.
+
+The model list rarely changes, so it is cached in ~/.cache/smart_buddy/models.json
+for 24 hours. Pass --refresh to force a live lookup.
+"""
+import json
 import os
+import sys
+import tempfile
+import time
+from pathlib import Path
 from dotenv import load_dotenv
-import google.generativeai as genai  # type: ignore
 
 load_dotenv()
 
+CACHE_FILE = Path.home() / ".cache" / "smart_buddy" / "models.json"
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def load_cached_models():
+    """Return the cached model list if it is fresh, else None."""
+    try:
+        if time.time() - CACHE_FILE.stat().st_mtime > CACHE_TTL_SECONDS:
+            return None
+        return json.loads(CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_models(models):
+    """Atomically write the model list so a concurrent run never reads half a file."""
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=CACHE_FILE.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(models, handle)
+    os.replace(tmp_name, CACHE_FILE)
+
+
+def fetch_models(api_key):
+    import google.generativeai as genai  # type: ignore
+
+    genai.configure(api_key=api_key)
+    return [
+        {
+            "name": model.name,
+            "display_name": model.display_name,
+            "description": model.description,
+        }
+        for model in genai.list_models()
+        if "generateContent" in model.supported_generation_methods
+    ]
+
+
 api_key = os.getenv("GOOGLE_API_KEY")
 if not api_key:
     print("ERROR: No GOOGLE_API_KEY found")
     exit(1)
 
-genai.configure(api_key=api_key)
+models = None if "--refresh" in sys.argv else load_cached_models()
+if models is None:
+    models = fetch_models(api_key)
+    try:
+        save_cached_models(models)
+    except OSError:
+        pass
 
 print("Available models for generateContent:")
 print("-" * 60)
-for model in genai.list_models():
-    if "generateContent" in model.supported_generation_methods:
-        print(f"- {model.name}")
-        print(f"  Display name: {model.display_name}")
-        print(f"  Description: {model.description[:80]}...")
-        print()
+for model in models:
+    print(f"- {model['name']}")
+    print(f"  Display name: {model['display_name']}")
+    print(f"  Description: {model['description'][:80]}...")
+    print()
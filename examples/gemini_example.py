@@ -7,56 +7,76 @@ using service account based auth.
 
 import os
 import json
+import importlib.util
+from functools import lru_cache
+
 import httpx
 
 
+@lru_cache(maxsize=None)
+def _client() -> httpx.Client:
+    """Shared client so repeated calls reuse pooled keep-alive connections."""
+    return httpx.Client(
+        timeout=30.0,
+        # HTTP/2 needs the optional `h2` package
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_keepalive_connections=10),
+    )
+
+
+@lru_cache(maxsize=None)
+def _service_account_credentials(credentials_path: str):
+    from google.oauth2 import service_account
+
+    scopes = ["https://www.googleapis.com/auth/cloud-platform"]
+    return service_account.Credentials.from_service_account_file(
+        credentials_path, scopes=scopes
+    )
+
+
 def call_gemini_with_api_key(prompt: str, api_key: str, model: str) -> None:
     endpoint = f"https://generativelanguage.googleapis.com/v1beta2/{model}:generate"
     headers = {"Content-Type": "application/json"}
     payload = {"prompt": {"text": prompt}, "temperature": 0.2}
     params = {"key": api_key}
 
-    with httpx.Client(timeout=30.0) as client:
-        r = client.post(endpoint, headers=headers, json=payload, params=params)
-        r.raise_for_status()
-        print(json.dumps(r.json(), indent=2))
+    r = _client().post(endpoint, headers=headers, json=payload, params=params)
+    r.raise_for_status()
+    print(json.dumps(r.json(), indent=2))
 
 
 def call_gemini_with_adc(prompt: str, model: str, credentials_path: str) -> None:
     # Use google-auth to create a signed JWT access token and call the REST endpoint with Bearer token
     try:
-        from google.oauth2 import service_account
         from google.auth.transport.requests import Request
-    except Exception as e:
+        creds = _service_account_credentials(credentials_path)
+    except ImportError as e:
         print("Missing google-auth libraries:", e)
         return
 
-    scopes = ["https://www.googleapis.com/auth/cloud-platform"]
-    creds = service_account.Credentials.from_service_account_file(
-        credentials_path, scopes=scopes
-    )
-    creds.refresh(Request())
+    # Credentials are cached, so only refresh when the token is missing or expired
+    if not creds.valid:
+        creds.refresh(Request())
     token = creds.token
 
     endpoint = f"https://generativelanguage.googleapis.com/v1beta2/{model}:generate"
     headers = {"Content-Type": "application/json", "Authorization": f"Bearer {token}"}
     payload = {"prompt": {"text": prompt}, "temperature": 0.2}
 
-    with httpx.Client(timeout=30.0) as client:
+    try:
+        r = _client().post(endpoint, headers=headers, json=payload)
+        r.raise_for_status()
+        print(json.dumps(r.json(), indent=2))
+    except httpx.HTTPStatusError as e:
+        # print status and response body for debugging (safe to share)
+        resp = e.response
+        print(f"HTTP error {resp.status_code}")
         try:
-            r = client.post(endpoint, headers=headers, json=payload)
-            r.raise_for_status()
-            print(json.dumps(r.json(), indent=2))
-        except httpx.HTTPStatusError as e:
-            # print status and response body for debugging (safe to share)
-            resp = e.response
-            print(f"HTTP error {resp.status_code}")
-            try:
-                print(json.dumps(resp.json(), indent=2))
-            except Exception:
-                print(resp.text)
-        except Exception as e:
-            print("Request failed:", e)
+            print(json.dumps(resp.json(), indent=2))
+        except Exception:
+            print(resp.text)
+    except Exception as e:
+        print("Request failed:", e)
 
 
 def main():
@@ -1,48 +1,95 @@
 """
-Example to run local gpt4all binary from Python and get a response.
-This example expects `models/gpt4all/gpt4all.exe` and a model file like `models/gpt4all/ggml-gpt4all-small.bin`.
-It calls the binary via subprocess and prints the output.
+Example to run a local gpt4all model from Python and get a response.
+Prefers the in-process `gpt4all` Python bindings (`pip install gpt4all`), which keep the
+weights loaded between prompts. Falls back to the `models/gpt4all/gpt4all.exe` binary via
+subprocess when the bindings are not installed. Expects a model file such as
+`models/gpt4all/ggml-gpt4all-small.bin` or a `.gguf` file in the same directory.
 """
 
 import os
 import subprocess
-import shlex
+from functools import lru_cache
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
 MODEL_DIR = os.path.join(ROOT, "models", "gpt4all")
 BINARY = os.path.join(MODEL_DIR, "gpt4all.exe")
-MODEL = None
-# pick any file in MODEL_DIR starting with ggml- or ending with .bin
-for f in os.listdir(MODEL_DIR) if os.path.exists(MODEL_DIR) else []:
-    if f.startswith("ggml") or f.endswith(".bin") or f.endswith(".bin.gz"):
-        MODEL = os.path.join(MODEL_DIR, f)
-        break
-
-if not os.path.exists(BINARY):
-    print("gpt4all binary not found at", BINARY)
-    print(
-        "Run scripts/install_gpt4all.ps1 to download a binary and model (or add them manually)."
+
+# pick the first file in MODEL_DIR starting with ggml- or ending with .gguf/.bin
+try:
+    _entries = os.scandir(MODEL_DIR)
+except FileNotFoundError:
+    MODEL = None
+else:
+    with _entries:
+        MODEL = next(
+            (
+                entry.path
+                for entry in _entries
+                if entry.is_file()
+                and (entry.name.startswith("ggml") or entry.name.endswith((".gguf", ".bin", ".bin.gz")))
+            ),
+            None,
+        )
+
+
+@lru_cache(maxsize=None)
+def load_model(model_path):
+    """Load the model once through the Python bindings; later prompts reuse it."""
+    from gpt4all import GPT4All  # type: ignore[import-not-found]
+
+    return GPT4All(
+        model_name=os.path.basename(model_path),
+        model_path=os.path.dirname(model_path),
+        allow_download=False,
     )
-    raise SystemExit(1)
-if not MODEL or not os.path.exists(MODEL):
-    print("Model file not found in", MODEL_DIR)
-    print("Place a ggml model (.bin) in that directory or update the script model URL.")
-    raise SystemExit(1)
-
-prompt = "Hello Smart Buddy, summarize the benefits of running a local model in one sentence."
-print("Using model:", MODEL)
-
-# Construct command for gpt4all CLI - flags vary by build; this is a general example
-cmd = f'"{BINARY}" --model "{MODEL}" --prompt "{prompt}" --n_predict 128'
-print("Running:", cmd)
-
-# Use subprocess to run and capture output
-proc = subprocess.Popen(
-    shlex.split(cmd), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-)
-out, err = proc.communicate(timeout=120)
-print("STDOUT:\n", out)
-print("STDERR:\n", err)
-
-if proc.returncode != 0:
-    raise SystemExit("gpt4all exited with code " + str(proc.returncode))
+
+
+def generate_many(prompts, max_tokens=128):
+    """Answer several prompts with the same in-process model."""
+    model = load_model(MODEL)
+    return [model.generate(prompt, max_tokens=max_tokens) for prompt in prompts]
+
+
+def run_binary(prompt):
+    """Fallback: call the gpt4all CLI binary (one process and model load per prompt)."""
+    if not os.path.exists(BINARY):
+        print("gpt4all binary not found at", BINARY)
+        print(
+            "Install the Python bindings (pip install gpt4all) or run scripts/install_gpt4all.ps1 "
+            "to download a binary and model (or add them manually)."
+        )
+        raise SystemExit(1)
+
+    # Construct command for gpt4all CLI - flags vary by build; this is a general example
+    argv = [BINARY, "--model", MODEL, "--prompt", prompt, "--n_predict", "128"]
+    print("Running:", subprocess.list2cmdline(argv))
+
+    # Pass argv directly so paths and prompts containing quotes survive intact
+    proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    out, err = proc.communicate(timeout=120)
+    print("STDOUT:\n", out)
+    print("STDERR:\n", err)
+
+    if proc.returncode != 0:
+        raise SystemExit("gpt4all exited with code " + str(proc.returncode))
+
+
+def main():
+    if not MODEL:
+        print("Model file not found in", MODEL_DIR)
+        print("Place a ggml/gguf model in that directory or update the script model URL.")
+        raise SystemExit(1)
+
+    prompt = "Hello Smart Buddy, summarize the benefits of running a local model in one sentence."
+    print("Using model:", MODEL)
+
+    try:
+        reply = generate_many([prompt])[0]
+    except ImportError:
+        run_binary(prompt)
+        return
+    print("Generated:\n", reply)
+
+
+if __name__ == "__main__":
+    main()
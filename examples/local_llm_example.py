@@ -14,20 +14,42 @@ This example uses `distilgpt2` which is small and runs on CPU. It's not instruct
 like Gemini, but it's free to run locally for demos and testing.
 """
 
-from transformers import pipeline
+import torch
+from transformers import AutoModelForCausalLM, AutoTokenizer
+
+MODEL_NAME = "distilgpt2"
+
+
+def load_model():
+    # bf16 weights halve memory traffic for this small, bandwidth-bound model
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = AutoModelForCausalLM.from_pretrained(MODEL_NAME, torch_dtype=torch.bfloat16).eval()
+    return tokenizer, model
+
+
+@torch.inference_mode()
+def generate(tokenizer, model, prompt: str, max_new_tokens: int = 64) -> str:
+    inputs = tokenizer(prompt, return_tensors="pt")
+    output_ids = model.generate(
+        **inputs,
+        max_new_tokens=max_new_tokens,
+        do_sample=False,
+        use_cache=True,
+        pad_token_id=tokenizer.eos_token_id,
+    )
+    return tokenizer.decode(output_ids[0], skip_special_tokens=True)
 
 
 def main():
     print(
         "Loading local text-generation model (distilgpt2). This may download weights..."
     )
-    generator = pipeline("text-generation", model="distilgpt2")
+    tokenizer, model = load_model()
     prompt = (
         "Hello Smart Buddy, please summarize the weather for today in one sentence."
     )
     print("Prompt:\n", prompt)
-    out = generator(prompt, max_length=80, num_return_sequences=1)
-    print("\nGenerated:\n", out[0]["generated_text"])
+    print("\nGenerated:\n", generate(tokenizer, model, prompt))
 
 
 if __name__ == "__main__":
@@ -1,10 +1,18 @@
 """Small demo runner showing use of Router and agents."""
 
+import asyncio
+
 from smart_buddy.agents import RouterAgent
 from smart_buddy.llm import LLM
 from smart_buddy.memory import MemoryBank
 
 
+async def _route_all(router, examples):
+    return await asyncio.gather(
+        *(router.route_async(user, session, text) for user, session, text in examples)
+    )
+
+
 def main():
     # create a shared MemoryBank file for demo persistence
     mem = MemoryBank(db_path="smart_buddy_memory.db")
@@ -17,15 +25,18 @@ def main():
         ("u2", "s2", "I feel lonely and stressed lately"),
     ]
 
-    for user, session, text in examples:
-        out = router.route(user, session, text)
+    # demonstrate LLM stub/gemini call: one request per example, run concurrently
+    replies = llm.generate_batch([f"Respond to: {text}" for _, _, text in examples])
+
+    # the examples are independent, so route them concurrently
+    outputs = asyncio.run(_route_all(router, examples))
+
+    for (user, session, text), out, reply in zip(examples, outputs, replies):
         print("---")
         print("Input:", text)
         print("Envelope:", out["envelope"])
         print("Result:", out["result"])
-        # demonstrate LLM stub/gemini call
-        resp = llm.generate(f"Respond to: {text}")
-        print("LLM sample reply:", resp)
+        print("LLM sample reply:", reply)
 
     # close memory connection when done
     try:
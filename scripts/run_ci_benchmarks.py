@@ -2,25 +2,29 @@
 from __future__ import annotations
 
 import json
+import os
+import tempfile
 from pathlib import Path
 from typing import Dict
 
 from smart_buddy.eval import EvaluationHarness
 
 TARGET_CATEGORIES = ["planner", "rag", "safety", "tools"]
+_MARKDOWN_HEADER = "| Category | Pass | Pass % | Score % |\n|---|---|---|---|"
+
+
+def _category_metrics(data: Dict) -> Dict:
+    return {
+        "pass_rate": round(data.get("pass_rate", 0.0) * 100, 2),
+        "score_pct": round(data.get("score_pct", 0.0) * 100, 2),
+        "passed": data.get("passed", 0),
+        "total": data.get("total", 0),
+    }
 
 
 def _extract_metrics(summary: Dict) -> Dict:
     categories = summary.get("categories", {})
-    metrics = {}
-    for name in TARGET_CATEGORIES:
-        data = categories.get(name, {})
-        metrics[name] = {
-            "pass_rate": round(data.get("pass_rate", 0.0) * 100, 2),
-            "score_pct": round(data.get("score_pct", 0.0) * 100, 2),
-            "passed": data.get("passed", 0),
-            "total": data.get("total", 0),
-        }
+    metrics = {name: _category_metrics(categories.get(name, {})) for name in TARGET_CATEGORIES}
     metrics["overall"] = {
         "pass_rate": round(summary.get("pass_rate", 0.0) * 100, 2),
         "score_pct": round(summary.get("score_pct", 0.0) * 100, 2),
@@ -31,7 +35,7 @@ def _extract_metrics(summary: Dict) -> Dict:
 
 def main() -> None:
     harness = EvaluationHarness(report_dir="reports/eval")
-    result = harness.run(
+    result = harness.run_parallel(
         regression_gates={
             "planner": 0.9,
             "rag": 0.8,
@@ -48,11 +52,17 @@ def main() -> None:
     history = bench_dir / "history.jsonl"
     markdown = bench_dir / "latest.md"
 
-    latest.write_text(json.dumps(metrics, indent=2), encoding="utf-8")
+    # Only the timestamp differs on an idempotent run; keep the previous files then
+    if not _same_metrics(latest, metrics):
+        _atomic_write(latest, json.dumps(metrics, indent=2))
     with history.open("a", encoding="utf-8") as handle:
         handle.write(json.dumps(metrics) + "\n")
+        handle.flush()
+        os.fsync(handle.fileno())
 
-    markdown.write_text(_render_markdown(metrics), encoding="utf-8")
+    rendered = _render_markdown(metrics)
+    if not markdown.exists() or markdown.read_text(encoding="utf-8") != rendered:
+        _atomic_write(markdown, rendered)
 
     print("Golden benchmarks updated:")
     print(json.dumps(metrics, indent=2))
@@ -61,18 +71,45 @@ def main() -> None:
         raise SystemExit(1)
 
 
+def _same_metrics(path: Path, metrics: Dict) -> bool:
+    """True when `path` already holds `metrics`, ignoring the run timestamp."""
+    try:
+        previous = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    if not isinstance(previous, dict):
+        return False
+    previous.pop("timestamp", None)
+    current = {k: v for k, v in metrics.items() if k != "timestamp"}
+    return previous == current
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    """Write via a temp file + rename so CI readers never see a partial file."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _markdown_row(name: str, data: Dict) -> str:
+    return f"| {name.title()} | {data.get('passed', 0)}/{data.get('total', 0)} | {data.get('pass_rate', 0):.2f}% | {data.get('score_pct', 0):.2f}% |"
+
+
 def _render_markdown(metrics: Dict) -> str:
-    lines = ["| Category | Pass | Pass % | Score % |", "|---|---|---|---|"]
-    for name in TARGET_CATEGORIES:
-        data = metrics.get(name, {})
-        lines.append(
-            f"| {name.title()} | {data.get('passed', 0)}/{data.get('total', 0)} | {data.get('pass_rate', 0):.2f}% | {data.get('score_pct', 0):.2f}% |"
-        )
+    rows = (_markdown_row(name, metrics.get(name, {})) for name in TARGET_CATEGORIES)
     overall = metrics.get("overall", {})
-    lines.append(
-        f"| Overall | — | {overall.get('pass_rate', 0):.2f}% | {overall.get('score_pct', 0):.2f}% |"
-    )
-    return "\n".join(lines)
+    footer = f"| Overall | — | {overall.get('pass_rate', 0):.2f}% | {overall.get('score_pct', 0):.2f}% |"
+    return "\n".join((_MARKDOWN_HEADER, *rows, footer))
 
 
 if __name__ == "__main__":
@@ -33,15 +33,22 @@ def main() -> None:
         default=0.9,
         help="Regression gate for safety category (0-1)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Worker threads for per-category execution; 1 runs serially (default: 4)",
+    )
     args = parser.parse_args()
 
     harness = EvaluationHarness(report_dir=args.report_dir)
-    result = harness.run(
+    result = harness.run_parallel(
         regression_gates={
             "planner": args.min_planner,
             "rag": args.min_rag,
             "safety": args.min_safety,
-        }
+        },
+        workers=args.workers,
     )
     summary = result["summary"]
     print(json.dumps(summary, indent=2))
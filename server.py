@@ -2,6 +2,7 @@
 
 Endpoints:
   POST /chat    -> Unified chat interface; optional `mode` to force agent.
+  POST /chat/stream -> Same as /chat but streams reply deltas as server-sent events.
   GET  /tasks/{user_id}  -> List tasks for user.
   GET  /events/{user_id} -> List calendar events for user.
   GET  /mentor/{user_id} -> Retrieve saved mentor plans/content.
@@ -10,29 +11,69 @@ Endpoints:
 
 Design:
   - If `mode` provided in request body (general|mentor|bestfriend) dispatch directly.
+    Concurrent direct-mode requests are coalesced per mode by a ChatBatcher so
+    their (separate, per-user) LLM calls run concurrently.
   - Otherwise uses RouterAgent intent classification.
   - Returns trace_id for observability.
   - MemoryBank shared across agent instances.
   - Metrics collection for all requests.
 """
 
+import asyncio
+import json
+import os
 import time
-from typing import Optional, Literal, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Literal, Dict, Any, Iterator, List
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
+try:  # optional: orjson serializes large `raw` envelopes several times faster
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as FastJSONResponse
+except ImportError:  # pragma: no cover - fall back to the stdlib encoder
+    FastJSONResponse = JSONResponse
+
 from smart_buddy.memory import MemoryBank
 from smart_buddy.agents.general_agent import GeneralAgent
 from smart_buddy.agents.mentor import MentorAgent
 from smart_buddy.agents.bestfriend import BestFriendAgent
 from smart_buddy.agents.router import RouterAgent
+from smart_buddy.batching import ChatBatcher
+from smart_buddy.cache import TTLCache
 from smart_buddy.logging import get_logger
 from smart_buddy.metrics import metrics
 
-app = FastAPI(title="Smart Buddy API", version="0.2.0")
+# The batchers and RouterAgent.route_async run blocking agent work (LLM calls,
+# SQLite) with asyncio.to_thread, i.e. on the loop's default executor. Its
+# CPU-based default of min(32, cpu + 4) workers is far too small for calls
+# that mostly wait on the network, so size it for I/O instead.
+AGENT_THREADS = int(os.getenv("SMART_BUDDY_AGENT_THREADS", "32"))
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    pool = ThreadPoolExecutor(max_workers=AGENT_THREADS, thread_name_prefix="agent")
+    asyncio.get_running_loop().set_default_executor(pool)
+    try:
+        yield
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(
+    title="Smart Buddy API",
+    version="0.2.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
+)
 logger = get_logger(__name__)
 
+# Monotonic, integer-nanosecond clock for request latency
+_pcn = time.perf_counter_ns
+
 # Shared memory instance
 memory = MemoryBank()
 
@@ -42,6 +83,42 @@ mentor_agent = MentorAgent(memory=memory)
 bestfriend_agent = BestFriendAgent()
 router_agent = RouterAgent(memory=memory)
 
+direct_agents = {
+    "general": general_agent,
+    "mentor": mentor_agent,
+    "bestfriend": bestfriend_agent,
+}
+
+# Short-lived cache for the polled read endpoints, keyed by (namespace, user_id).
+# Chat requests can write tasks/events/plans, so they invalidate the user's entries.
+_read_cache = TTLCache(maxsize=1024, ttl=2.0)
+_CACHED_NAMESPACES = ("tasks", "events", "mentor")
+
+
+def _cached_read(namespace: str, user_id: str, default: Any) -> Any:
+    return _read_cache.get_or_set(
+        (namespace, user_id), lambda: memory.get(namespace, user_id, default) or default
+    )
+
+
+def _cached_list(namespace: str, user_id: str) -> List[Any]:
+    return _read_cache.get_or_set(
+        (namespace, user_id), lambda: memory.list_all(namespace, user_id)
+    )
+
+
+def _invalidate_user(user_id: str) -> None:
+    for namespace in _CACHED_NAMESPACES:
+        _read_cache.pop((namespace, user_id), None)
+
+
+# One batcher per mode so each batch shares the same prompt style
+batchers = {
+    "general": ChatBatcher(general_agent.handle_batch, name="general"),
+    "mentor": ChatBatcher(mentor_agent.handle_batch, name="mentor"),
+    "bestfriend": ChatBatcher(bestfriend_agent.handle_batch, name="bestfriend"),
+}
+
 
 class ChatRequest(BaseModel):
     user_id: str = "user"
@@ -63,13 +140,13 @@ def health() -> Dict[str, str]:
 
 
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
+async def chat(req: ChatRequest):
     """Unified chat endpoint with metrics tracking.
 
     If `mode` specified, dispatch directly to that agent; else use RouterAgent
     for intent classification and routing.
     """
-    start_time = time.time()
+    start_ns = _pcn()
     text = req.message.strip()
     error = None
     
@@ -86,20 +163,16 @@ def chat(req: ChatRequest):
                     "text": text,
                 },
             }
-            if req.mode == "general":
-                result = general_agent.handle(envelope)
-            elif req.mode == "mentor":
-                result = mentor_agent.handle(envelope)
-            elif req.mode == "bestfriend":
-                result = bestfriend_agent.handle(envelope)
-            else:
+            batcher = batchers.get(req.mode)
+            if batcher is None:
                 raise HTTPException(status_code=400, detail="Unsupported mode")
+            result = await batcher.submit(envelope)
             reply = result.get("reply") or result.get("message") or "(no reply)"
             mode = req.mode
             intent = req.mode
             trace_id = envelope["meta"]["trace_id"]
         else:
-            routed = router_agent.route(req.user_id, req.session_id or "web_session", text)
+            routed = await router_agent.route_async(req.user_id, req.session_id or "web_session", text)
             envelope = routed.get("envelope", {})
             result = routed.get("result", {})
             reply = result.get("reply") or "(no reply)"
@@ -108,7 +181,7 @@ def chat(req: ChatRequest):
             trace_id = envelope.get("meta", {}).get("trace_id")
         
         # Calculate latency
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (_pcn() - start_ns) / 1_000_000.0
         
         # Record metrics
         metrics.record_request(
@@ -123,7 +196,7 @@ def chat(req: ChatRequest):
     
     except Exception as e:
         error = str(e)
-        latency_ms = (time.time() - start_time) * 1000
+        latency_ms = (_pcn() - start_ns) / 1_000_000.0
         metrics.record_request(
             mode=req.mode or "unknown",
             intent="error",
@@ -131,24 +204,94 @@ def chat(req: ChatRequest):
             error=type(e).__name__
         )
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _invalidate_user(req.user_id)
+
+
+def _sse(data: Dict[str, Any]) -> str:
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/chat/stream")
+def chat_stream(req: ChatRequest):
+    """Streaming chat endpoint (server-sent events).
+
+    Emits ``{"delta": ...}`` frames as the agent produces text and a final
+    ``{"done": true, ...}`` frame with the trace id and mode. General and
+    mentor replies stream token by token; other agents send one delta.
+    Metrics record time to first chunk and time to last chunk separately.
+    """
+    text = req.message.strip()
+    if not text:
+        raise HTTPException(status_code=400, detail="Empty message")
+    session_id = req.session_id or "web_session"
+
+    def events() -> Iterator[str]:
+        start_ns = _pcn()
+        first_chunk_ns: Optional[int] = None
+        mode = req.mode or "unknown"
+        intent = req.mode or "unknown"
+        error = None
+        try:
+            if req.mode:
+                envelope = {
+                    "meta": {"from": "api", "to": req.mode, "trace_id": "direct"},
+                    "payload": {"user_id": req.user_id, "session_id": session_id, "text": text},
+                }
+                agent = direct_agents[req.mode]
+                if hasattr(agent, "handle_stream"):
+                    chunks: Iterator[str] = agent.handle_stream(envelope)
+                else:
+                    chunks = iter([agent.handle(envelope).get("reply") or "(no reply)"])
+            else:
+                routed = router_agent.route(req.user_id, session_id, text)
+                envelope = routed.get("envelope", {})
+                mode = envelope.get("meta", {}).get("to", "general")
+                intent = envelope.get("payload", {}).get("intent", {}).get("intent", "unknown")
+                chunks = iter([routed.get("result", {}).get("reply") or "(no reply)"])
+            trace_id = envelope.get("meta", {}).get("trace_id")
+
+            for chunk in chunks:
+                if first_chunk_ns is None:
+                    first_chunk_ns = _pcn()
+                yield _sse({"delta": chunk})
+            yield _sse({"done": True, "trace_id": trace_id, "mode": mode})
+        except Exception as e:
+            error = type(e).__name__
+            intent = "error"
+            yield _sse({"error": str(e)})
+        finally:
+            _invalidate_user(req.user_id)
+            end_ns = _pcn()
+            metrics.record_request(
+                mode=mode,
+                intent=intent,
+                latency_ms=(end_ns - start_ns) / 1_000_000.0,
+                error=error,
+                ttft_ms=(first_chunk_ns - start_ns) / 1_000_000.0 if first_chunk_ns is not None else None,
+            )
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 
+# The read endpoints return the response class directly so FastAPI skips
+# jsonable_encoder on what is already plain JSON from MemoryBank.
 @app.get("/tasks/{user_id}")
-def get_tasks(user_id: str) -> Dict[str, Any]:
-    tasks = memory.get("tasks", user_id, []) or []
-    return {"user_id": user_id, "tasks": tasks, "count": len(tasks)}
+def get_tasks(user_id: str) -> JSONResponse:
+    tasks = _cached_list("tasks", user_id)
+    return FastJSONResponse({"user_id": user_id, "tasks": tasks, "count": len(tasks)})
 
 
 @app.get("/events/{user_id}")
-def get_events(user_id: str) -> Dict[str, Any]:
-    events = memory.get("events", user_id, []) or []
-    return {"user_id": user_id, "events": events, "count": len(events)}
+def get_events(user_id: str) -> JSONResponse:
+    events = _cached_list("events", user_id)
+    return FastJSONResponse({"user_id": user_id, "events": events, "count": len(events)})
 
 
 @app.get("/mentor/{user_id}")
-def get_mentor_content(user_id: str) -> Dict[str, Any]:
-    content = memory.get("mentor", user_id, {}) or {}
-    return {"user_id": user_id, "mentor_content": content}
+def get_mentor_content(user_id: str) -> JSONResponse:
+    content = _cached_read("mentor", user_id, {})
+    return FastJSONResponse({"user_id": user_id, "mentor_content": content})
 
 
 # Convenience root
@@ -169,4 +312,12 @@ if __name__ == "__main__":
     print("🚀 Starting Smart Buddy API Server...")
     print("📊 Metrics dashboard: http://127.0.0.1:8000/metrics")
     print("📖 API docs: http://127.0.0.1:8000/docs")
-    uvicorn.run("server:app", host="127.0.0.1", port=8000, reload=True)
+    # Auto-reload only for development (SMART_BUDDY_DEV=1); uvicorn[standard]
+    # picks uvloop + httptools automatically where they are available.
+    uvicorn.run(
+        "server:app",
+        host="127.0.0.1",
+        port=8000,
+        reload=bool(os.getenv("SMART_BUDDY_DEV")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
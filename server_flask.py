@@ -3,14 +3,66 @@
 Avoids FastAPI/Pydantic version conflicts.
 Perfect for local testing and demos.
 """
+import codecs
 import time
 import json
 import logging
-from flask import Flask, request, jsonify, render_template_string, redirect, url_for, send_from_directory
+import threading
+from flask import Flask, Response, request, jsonify, redirect, url_for, send_from_directory
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import NotFound
 import os
 
+from smart_buddy import agents  # agent classes load lazily on first access
+from smart_buddy.http_core import UnknownModeError, chat_impl, read_user_dict, read_user_list
+
+try:  # optional: orjson speeds up JSON responses and audit payload rendering
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib encoder
+    orjson = None
+
+# orjson encodes these itself; hand them to the provider's `default` instead so
+# datetimes keep Flask's http_date format and dataclasses go through its hook
+_ORJSON_PASSTHROUGH = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS if orjson is not None else 0
+)
+
 logger = logging.getLogger(__name__)
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider that encodes jsonify() responses with orjson.
+
+    Keeps the default provider's key sorting, pretty-printing in debug and
+    `default` hook (datetime and dataclass values are passed through to it
+    rather than encoded by orjson), and falls back to it for anything orjson
+    rejects (e.g. non-string dict keys).
+    """
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_APPEND_NEWLINE | _ORJSON_PASSTHROUGH
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        try:
+            body = orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+# Never stat templates for changes outside development; must be set before
+# app.jinja_env is first created below
+app.config["TEMPLATES_AUTO_RELOAD"] = bool(os.getenv("SMART_BUDDY_DEV"))
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
 AUDIT_TEMPLATE = """
 <!DOCTYPE html>
 <html>
@@ -45,59 +97,155 @@ AUDIT_TEMPLATE = """
     </div>
     <table>
         <tr><th>ID</th><th>Type</th><th>Trace</th><th>Severity</th><th>Status</th><th>Payload</th></tr>
-        {% for event in events %}
+        {% for event, payload_json in rows %}
             <tr>
                 <td>{{ event.id }}</td>
                 <td>{{ event.event_type }}</td>
                 <td>{{ event.trace_id }}</td>
                 <td>{{ event.severity }}</td>
                 <td class=\"status-{{ event.status }}\">{{ event.status }}</td>
-                <td><pre style=\"white-space: pre-wrap; font-size: 11px;\">{{ json.dumps(event.payload, indent=2) }}</pre></td>
+                <td><pre style=\"white-space: pre-wrap; font-size: 11px;\">{{ payload_json }}</pre></td>
             </tr>
         {% endfor %}
     </table>
 </body>
 </html>
 """
+# Compile once; render_template_string would re-parse the template on every request
+_AUDIT_TPL = app.jinja_env.from_string(AUDIT_TEMPLATE)
+
+
+def _err(message, status=400):
+    """JSON error response built directly, without jsonify's provider lookup."""
+    if orjson is not None:
+        body = orjson.dumps({"error": message})
+    else:
+        body = json.dumps({"error": message})
+    return Response(body, status=status, mimetype="application/json")
+
+
+def _dumps_bytes(obj):
+    """Compact JSON with the app JSON provider's key sorting and `default` hook."""
+    provider = app.json
+    if orjson is not None:
+        option = _ORJSON_PASSTHROUGH | (orjson.OPT_SORT_KEYS if provider.sort_keys else 0)
+        try:
+            return orjson.dumps(obj, default=provider.default, option=option)
+        except TypeError:
+            pass
+    return json.dumps(
+        obj, sort_keys=provider.sort_keys, default=provider.default, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _list_response(user_id, key, items):
+    """`{"user_id", key: items, "count"}` as JSON, streamed for long lists.
+
+    Short lists go through jsonify; past _STREAM_LIST_THRESHOLD items the
+    body is written in chunks so the whole document is never built at once.
+    Both paths order keys the same way (the provider's `sort_keys`).
+    """
+    if len(items) <= _STREAM_LIST_THRESHOLD:
+        return jsonify({"user_id": user_id, key: items, "count": len(items)})
+
+    fields = [("user_id", user_id), ("count", len(items)), (key, items)]
+    if app.json.sort_keys:
+        fields.sort(key=lambda field: field[0])
+
+    def generate():
+        sep = b"{"
+        for name, value in fields:
+            yield sep + _dumps_bytes(name) + b":"
+            sep = b","
+            if name != key:
+                yield _dumps_bytes(value)
+                continue
+            yield b"["
+            for start in range(0, len(items), _STREAM_CHUNK_ITEMS):
+                chunk = _dumps_bytes(items[start:start + _STREAM_CHUNK_ITEMS])[1:-1]
+                yield chunk if start == 0 else b"," + chunk
+            yield b"]"
+        yield b"}\n"
+
+    return Response(generate(), mimetype="application/json")
+
+
+def _payload_json(payload):
+    """Pretty-print an audit payload for the console."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(payload, indent=2, default=str)
+
+
+_TEXT_PREVIEW_CHARS = 1000
+_VIDEO_EXTS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+# /tasks and /events switch to a streamed body past this many items
+_STREAM_LIST_THRESHOLD = 500
+_STREAM_CHUNK_ITEMS = 100
+
+
+def _upload_size(stream):
+    """Size of an uploaded file without reading its body."""
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def _text_preview(stream):
+    """First 1000 characters of a text upload, or None if it looks binary.
+
+    A NUL byte marks the file as binary; otherwise stray invalid UTF-8 is
+    replaced rather than raising.
+    """
+    # 4 bytes per character is the UTF-8 worst case
+    head = stream.read(_TEXT_PREVIEW_CHARS * 4)
+    if b"\0" in head:
+        return None
+    # incremental decoder so a character split at the cut is not replaced
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    return decoder.decode(head, final=len(head) < _TEXT_PREVIEW_CHARS * 4)[:_TEXT_PREVIEW_CHARS]
 
 
 # Lazy initialization to avoid import errors on startup
-_memory = None
-_general_agent = None
-_mentor_agent = None
-_bestfriend_agent = None
-_router_agent = None
-_metrics = None
+# (memory, general, mentor, bestfriend, router, metrics) once built
+_agents = None
+_mode_agents = {}  # direct-mode name -> agent, filled alongside _agents
+_agents_lock = threading.Lock()
 
 
 def get_agents():
     """Lazy load agents on first request."""
-    global _memory, _general_agent, _mentor_agent, _bestfriend_agent, _router_agent, _metrics
-    
-    if _memory is None:
-        from smart_buddy.memory import MemoryBank
-        from smart_buddy.agents.general_agent import GeneralAgent
-        from smart_buddy.agents.mentor import MentorAgent
-        from smart_buddy.agents.bestfriend import BestFriendAgent
-        from smart_buddy.agents.router import RouterAgent
-        from smart_buddy.metrics import metrics
-        from smart_buddy.audit import audit_trail  # noqa: F401 - ensure module initialized
-        
-        _memory = MemoryBank()
-        _general_agent = GeneralAgent(memory=_memory)
-        _mentor_agent = MentorAgent(memory=_memory)
-        _bestfriend_agent = BestFriendAgent()
-        _router_agent = RouterAgent(memory=_memory)
-        _metrics = metrics
-    
-    assert _memory is not None
-    assert _general_agent is not None
-    assert _mentor_agent is not None
-    assert _bestfriend_agent is not None
-    assert _router_agent is not None
-    assert _metrics is not None
-
-    return _memory, _general_agent, _mentor_agent, _bestfriend_agent, _router_agent, _metrics
+    global _agents
+
+    if _agents is not None:
+        return _agents
+
+    with _agents_lock:
+        if _agents is None:
+            from smart_buddy.memory import MemoryBank
+            from smart_buddy.metrics import metrics
+            from smart_buddy.audit import audit_trail  # noqa: F401 - ensure module initialized
+
+            memory = MemoryBank()
+            general_agent = agents.GeneralAgent(memory=memory)
+            mentor_agent = agents.MentorAgent(memory=memory)
+            bestfriend_agent = agents.BestFriendAgent()
+            _mode_agents.update(
+                general=general_agent, mentor=mentor_agent, bestfriend=bestfriend_agent
+            )
+            _agents = (
+                memory,
+                general_agent,
+                mentor_agent,
+                bestfriend_agent,
+                agents.RouterAgent(memory=memory),
+                metrics,
+            )
+    return _agents
 
 
 @app.route("/", methods=["GET"])
@@ -110,14 +258,12 @@ def root():
 @app.route("/chat-ui", methods=["GET"])
 def chat_ui():
     """Serve the Google AI Agent-style chat interface."""
-    static_dir = os.path.join(os.path.dirname(__file__), 'static')
-    chat_html_path = os.path.join(static_dir, 'chat.html')
-    
+    # send_from_directory streams the file (sendfile where available) and
+    # answers conditional requests with 304, instead of reading it per request
     try:
-        with open(chat_html_path, 'r', encoding='utf-8') as f:
-            return f.read()
-    except FileNotFoundError:
-        return jsonify({"error": "Chat UI not found"}), 404
+        return send_from_directory(STATIC_DIR, 'chat.html', mimetype='text/html')
+    except NotFound:
+        return _err("Chat UI not found", 404)
 
 
 @app.route("/api", methods=["GET"])
@@ -146,8 +292,8 @@ def health():
 @app.route("/chat", methods=["POST"])
 def chat():
     """Main chat endpoint with file upload support."""
-    memory, general_agent, mentor_agent, bestfriend_agent, router_agent, metrics = get_agents()
-    start_time = time.time()
+    _, _, _, _, router_agent, metrics = get_agents()
+    start_time = time.perf_counter()
     
     # Check if this is a file upload (multipart/form-data) or JSON
     if request.content_type and 'multipart/form-data' in request.content_type:
@@ -156,61 +302,52 @@ def chat():
         session_id = request.form.get("session_id", "web_session")
         message = request.form.get("message", "").strip()
         mode = request.form.get("mode")
-        file_count = int(request.form.get("file_count", 0))
         
         # Process uploaded files with image/video support
         file_info = []
         image_data = []
-        for i in range(file_count):
-            file_key = f"file_{i}"
-            if file_key in request.files:
-                file = request.files[file_key]
-                if file.filename:
-                    # Read file content
-                    content = file.read()
-                    content_type = file.content_type or "unknown"
-                    file_info.append({
-                        "name": file.filename,
-                        "size": len(content),
-                        "type": content_type
-                    })
-                    
-                    # Handle text files
-                    if 'text' in content_type:
-                        try:
-                            text_content = content.decode('utf-8')
-                            message += f"\n\n--- File: {file.filename} ---\n{text_content[:1000]}"
-                        except:
-                            message += f"\n\n[File: {file.filename} - binary content, {len(content)} bytes]"
-                    
-                    # Handle image files
-                    elif 'image' in content_type:
-                        import base64
-                        b64_data = base64.b64encode(content).decode('utf-8')
-                        image_data.append({
-                            "filename": file.filename,
-                            "mime_type": content_type,
-                            "data": b64_data
-                        })
-                        message += f"\n\n[📷 Image: {file.filename}]"
-                        logger.info(f"Image file received: {file.filename} ({len(content)} bytes)")
-                    
-                    # Handle video files
-                    elif 'video' in content_type:
-                        # Extract video metadata
-                        video_formats = ['.mp4', '.avi', '.mov', '.mkv', '.webm']
-                        is_video = any(file.filename.lower().endswith(fmt) for fmt in video_formats)
-                        if is_video:
-                            message += f"\n\n[🎥 Video: {file.filename}, {len(content)} bytes, {content_type}]"
-                            logger.info(f"Video file received: {file.filename} ({len(content)} bytes)")
-                    
-                    # Other binary files
+        for _, file in request.files.items(multi=True):
+            if file.filename:
+                # Only the size is needed up front; bodies are streamed below
+                size = _upload_size(file.stream)
+                content_type = file.content_type or "unknown"
+                file_info.append({
+                    "name": file.filename,
+                    "size": size,
+                    "type": content_type
+                })
+                
+                # Handle text files
+                if 'text' in content_type:
+                    text_content = _text_preview(file.stream)
+                    if text_content is not None:
+                        message += f"\n\n--- File: {file.filename} ---\n{text_content}"
                     else:
-                        message += f"\n\n[📄 File: {file.filename} - {len(content)} bytes, {content_type}]"
+                        message += f"\n\n[File: {file.filename} - binary content, {size} bytes]"
+                
+                # Handle image files
+                elif 'image' in content_type:
+                    image_data.append({"filename": file.filename, "mime_type": content_type, "size": size})
+                    message += f"\n\n[📷 Image: {file.filename}]"
+                    logger.info("Image file received: %s (%d bytes)", file.filename, size)
+                
+                # Handle video files
+                elif 'video' in content_type:
+                    # Extract video metadata
+                    if file.filename.lower().endswith(_VIDEO_EXTS):
+                        message += f"\n\n[🎥 Video: {file.filename}, {size} bytes, {content_type}]"
+                        logger.info("Video file received: %s (%d bytes)", file.filename, size)
+                
+                # Other binary files
+                else:
+                    message += f"\n\n[📄 File: {file.filename} - {size} bytes, {content_type}]"
         
-        if file_info:
-            file_summary = ", ".join([f"{f['name']} ({f['size']} bytes)" for f in file_info])
-            logger.info(f"Received {len(file_info)} files: {file_summary}")
+        if file_info and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Received %d files: %s",
+                len(file_info),
+                ", ".join(f"{f['name']} ({f['size']} bytes)" for f in file_info),
+            )
         
         # If images present, enhance message for vision analysis
         if image_data:
@@ -224,73 +361,43 @@ def chat():
         mode = data.get("mode")
     
     if not message:
-        return jsonify({"error": "Empty message"}), 400
+        return _err("Empty message", 400)
     
     try:
-        if mode:
-            # Direct mode
-            envelope = {
-                "meta": {"from": "api", "to": mode, "trace_id": f"api_{int(time.time()*1000)}"},
-                "payload": {"user_id": user_id, "session_id": session_id, "text": message}
-            }
-            
-            if mode == "general":
-                result = general_agent.handle(envelope)
-            elif mode == "mentor":
-                result = mentor_agent.handle(envelope)
-            elif mode == "bestfriend":
-                result = bestfriend_agent.handle(envelope)
-            else:
-                return jsonify({"error": f"Unknown mode: {mode}"}), 400
-            
-            reply = result.get("reply", "No reply")
-            intent = mode
-            trace_id = envelope["meta"]["trace_id"]
-        else:
-            # Auto routing
-            routed = router_agent.route(user_id, session_id, message)
-            envelope = routed.get("envelope", {})
-            result = routed.get("result", {})
-            reply = result.get("reply", "No reply")
-            mode = envelope.get("meta", {}).get("to", "general")
-            intent = envelope.get("payload", {}).get("intent", {}).get("intent", "unknown")
-            trace_id = envelope.get("meta", {}).get("trace_id", "unknown")
-        
-        # Metrics
-        latency_ms = (time.time() - start_time) * 1000
-        metrics.record_request(mode=mode, intent=intent, latency_ms=latency_ms)
-        
-        return jsonify({
-            "reply": reply,
-            "trace_id": trace_id,
-            "mode": mode,
-            "latency_ms": round(latency_ms, 2)
-        })
-    
+        return jsonify(chat_impl(
+            user_id=user_id,
+            session_id=session_id,
+            message=message,
+            mode=mode,
+            mode_agents=_mode_agents,
+            router_agent=router_agent,
+            metrics=metrics,
+            start_time=start_time,
+        ))
+    except UnknownModeError as e:
+        return _err(str(e), 400)
     except Exception as e:
-        latency_ms = (time.time() - start_time) * 1000
-        metrics.record_request(mode=mode or "unknown", intent="error", latency_ms=latency_ms, error=type(e).__name__)
-        return jsonify({"error": str(e)}), 500
+        return _err(str(e), 500)
 
 
 @app.route("/tasks/<user_id>", methods=["GET"])
 def get_tasks(user_id):
     memory, _, _, _, _, _ = get_agents()
-    tasks = memory.get("tasks", user_id, []) or []
-    return jsonify({"user_id": user_id, "tasks": tasks, "count": len(tasks)})
+    tasks = read_user_list(memory, "tasks", user_id)
+    return _list_response(user_id, "tasks", tasks)
 
 
 @app.route("/events/<user_id>", methods=["GET"])
 def get_events(user_id):
     memory, _, _, _, _, _ = get_agents()
-    events = memory.get("events", user_id, []) or []
-    return jsonify({"user_id": user_id, "events": events, "count": len(events)})
+    events = read_user_list(memory, "events", user_id)
+    return _list_response(user_id, "events", events)
 
 
 @app.route("/mentor/<user_id>", methods=["GET"])
 def get_mentor(user_id):
     memory, _, _, _, _, _ = get_agents()
-    content = memory.get("mentor", user_id, {}) or {}
+    content = read_user_dict(memory, "mentor", user_id)
     return jsonify({"user_id": user_id, "mentor_content": content})
 
 
@@ -306,7 +413,8 @@ def audit_console():
     from smart_buddy.audit import audit_trail
 
     events = audit_trail.list_events(limit=150)
-    return render_template_string(AUDIT_TEMPLATE, events=events, json=json)
+    rows = [(event, _payload_json(event["payload"])) for event in events]
+    return _AUDIT_TPL.render(rows=rows)
 
 
 @app.route("/audit/export", methods=["GET"])
@@ -337,7 +445,7 @@ def audit_override():
         return jsonify(resp)
     if resp.get("status") == "ok":
         return redirect(url_for("audit_console"))
-    return jsonify(resp), 400
+    return _err(resp.get("message", "event not found"))
 
 
 if __name__ == "__main__":
@@ -345,4 +453,8 @@ if __name__ == "__main__":
     print("📊 Metrics Dashboard: http://127.0.0.1:8000/metrics")
     print("💬 Chat Endpoint: POST http://127.0.0.1:8000/chat")
     print("📖 Health Check: http://127.0.0.1:8000/health")
-    app.run(host="127.0.0.1", port=8000, debug=True)
+    print("🏭 Beyond localhost demos, serve wsgi:app with a production server, e.g.")
+    print("   gunicorn -w 4 -k gthread --threads 8 wsgi:app   (Linux/Mac)")
+    print("   waitress-serve --port=8000 --threads=8 wsgi:app  (Windows)")
+    # Reloader + debugger only when SMART_BUDDY_DEV is set
+    app.run(host="127.0.0.1", port=8000, debug=bool(os.getenv("SMART_BUDDY_DEV")))
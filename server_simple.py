@@ -2,6 +2,7 @@
 
 Avoids Pydantic version conflicts by using dict-based requests.
 """
+import os
 import time
 from typing import Dict, Any
 from fastapi import FastAPI, HTTPException
@@ -13,6 +14,7 @@ from smart_buddy.agents.mentor import MentorAgent
 from smart_buddy.agents.bestfriend import BestFriendAgent
 from smart_buddy.agents.router import RouterAgent
 from smart_buddy.metrics import metrics
+from smart_buddy.http_core import UnknownModeError, chat_impl, read_user_dict, read_user_list
 
 app = FastAPI(title="Smart Buddy API", version="0.2.0")
 
@@ -22,6 +24,11 @@ general_agent = GeneralAgent(memory=memory)
 mentor_agent = MentorAgent(memory=memory)
 bestfriend_agent = BestFriendAgent()
 router_agent = RouterAgent(memory=memory)
+mode_agents = {
+    "general": general_agent,
+    "mentor": mentor_agent,
+    "bestfriend": bestfriend_agent,
+}
 
 
 @app.get("/health")
@@ -32,7 +39,7 @@ def health() -> Dict[str, str]:
 @app.post("/chat")
 def chat(request: Dict[str, Any]):
     """Chat endpoint accepting dict payload."""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     user_id = request.get("user_id", "user")
     session_id = request.get("session_id", "web_session")
@@ -43,67 +50,37 @@ def chat(request: Dict[str, Any]):
         raise HTTPException(status_code=400, detail="Empty message")
     
     try:
-        if mode:
-            # Direct mode routing
-            envelope = {
-                "meta": {"from": "api", "to": mode, "trace_id": f"api_{int(time.time()*1000)}"},
-                "payload": {"user_id": user_id, "session_id": session_id, "text": message}
-            }
-            
-            if mode == "general":
-                result = general_agent.handle(envelope)
-            elif mode == "mentor":
-                result = mentor_agent.handle(envelope)
-            elif mode == "bestfriend":
-                result = bestfriend_agent.handle(envelope)
-            else:
-                raise HTTPException(status_code=400, detail=f"Unknown mode: {mode}")
-            
-            reply = result.get("reply", "No reply")
-            intent = mode
-            trace_id = envelope["meta"]["trace_id"]
-        else:
-            # Auto routing
-            routed = router_agent.route(user_id, session_id, message)
-            envelope = routed.get("envelope", {})
-            result = routed.get("result", {})
-            reply = result.get("reply", "No reply")
-            mode = envelope.get("meta", {}).get("to", "general")
-            intent = envelope.get("payload", {}).get("intent", {}).get("intent", "unknown")
-            trace_id = envelope.get("meta", {}).get("trace_id", "unknown")
-        
-        # Record metrics
-        latency_ms = (time.time() - start_time) * 1000
-        metrics.record_request(mode=mode, intent=intent, latency_ms=latency_ms)
-        
-        return {
-            "reply": reply,
-            "trace_id": trace_id,
-            "mode": mode,
-            "latency_ms": round(latency_ms, 2)
-        }
-    
+        return chat_impl(
+            user_id=user_id,
+            session_id=session_id,
+            message=message,
+            mode=mode,
+            mode_agents=mode_agents,
+            router_agent=router_agent,
+            metrics=metrics,
+            start_time=start_time,
+        )
+    except UnknownModeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        latency_ms = (time.time() - start_time) * 1000
-        metrics.record_request(mode=mode or "unknown", intent="error", latency_ms=latency_ms, error=type(e).__name__)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/tasks/{user_id}")
 def get_tasks(user_id: str) -> Dict[str, Any]:
-    tasks = memory.get("tasks", user_id, []) or []
+    tasks = read_user_list(memory, "tasks", user_id)
     return {"user_id": user_id, "tasks": tasks, "count": len(tasks)}
 
 
 @app.get("/events/{user_id}")
 def get_events(user_id: str) -> Dict[str, Any]:
-    events = memory.get("events", user_id, []) or []
+    events = read_user_list(memory, "events", user_id)
     return {"user_id": user_id, "events": events, "count": len(events)}
 
 
 @app.get("/mentor/{user_id}")
 def get_mentor_content(user_id: str) -> Dict[str, Any]:
-    content = memory.get("mentor", user_id, {}) or {}
+    content = read_user_dict(memory, "mentor", user_id)
     return {"user_id": user_id, "mentor_content": content}
 
 
@@ -133,4 +110,12 @@ if __name__ == "__main__":
     print("🚀 Starting Smart Buddy API Server...")
     print("📊 Metrics: http://127.0.0.1:8000/metrics")
     print("📖 Docs: http://127.0.0.1:8000/docs")
-    uvicorn.run("server_simple:app", host="127.0.0.1", port=8000, reload=True)
+    # Auto-reload only for development (SMART_BUDDY_DEV=1); uvicorn[standard]
+    # picks uvloop + httptools automatically where they are available.
+    uvicorn.run(
+        "server_simple:app",
+        host="127.0.0.1",
+        port=8000,
+        reload=bool(os.getenv("SMART_BUDDY_DEV")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
@@ -1,11 +1,29 @@
-"""Agents package for Smart Buddy skeleton."""
+"""Agents package for Smart Buddy skeleton.
 
-from .router import RouterAgent
-from .intent import IntentAgent
-from .general_agent import GeneralAgent
-from .mentor import MentorAgent
-from .bestfriend import BestFriendAgent
-from .planner import PlannerAgent
+Agent classes are imported lazily on first attribute access (PEP 562) so
+importing the package does not pull in the LLM client and memory stack
+until an agent is actually needed.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+	from .router import RouterAgent
+	from .intent import IntentAgent
+	from .general_agent import GeneralAgent
+	from .mentor import MentorAgent
+	from .bestfriend import BestFriendAgent
+	from .planner import PlannerAgent
+
+_LAZY_ATTRS = {
+	"RouterAgent": ".router",
+	"IntentAgent": ".intent",
+	"GeneralAgent": ".general_agent",
+	"MentorAgent": ".mentor",
+	"BestFriendAgent": ".bestfriend",
+	"PlannerAgent": ".planner",
+}
 
 __all__ = [
 	"RouterAgent",
@@ -15,3 +33,16 @@ __all__ = [
 	"BestFriendAgent",
 	"PlannerAgent",
 ]
+
+
+def __getattr__(name: str) -> Any:
+	module_name = _LAZY_ATTRS.get(name)
+	if module_name is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	value = getattr(importlib.import_module(module_name, __name__), name)
+	globals()[name] = value  # cache so later lookups skip __getattr__
+	return value
+
+
+def __dir__() -> List[str]:
+	return sorted(set(globals()) | set(__all__))
@@ -25,10 +25,27 @@ LLM Strategy:
     - No memory persistence (stateless emotional support)
 """ 
 
-from typing import Dict
+from typing import Dict, List
 from smart_buddy.llm import LLM
 from smart_buddy.logging import get_logger
 
+# Longer pasted messages are cut before prompting to bound LLM token usage
+MAX_PROMPT_TEXT_CHARS = 2000
+
+_FALLBACK_TEMPLATE = "aww bestie 💕 i'm here for you always! {}... i totally get it 🫂"
+
+_PROMPT_PREFIX = 'You are my BEST FRIEND chatting casually. I just said: "'
+_PROMPT_SUFFIX = """"
+
+Respond like texting your bestie:
+- Use 2-4 emojis naturally 💕✨😊
+- Be casual ("omg", "aww", "yesss", "honestly", "literally")
+- Keep it brief (1-3 sentences)
+- React naturally - be supportive, excited, or empathetic
+- Chat and flow naturally - don't ask follow-up questions
+- Sound like a text message, not formal
+
+Just vibe with the conversation!"""
 
 class BestFriendAgent:
     """Casual conversation agent providing emotional support like a best friend.
@@ -42,7 +59,7 @@ class BestFriendAgent:
     """
     def __init__(self):
         self._logger = get_logger(__name__)
-        self.llm = LLM()
+        self.llm = LLM.get_default()
     
     def handle(self, envelope: Dict) -> Dict:
         """Generate casual, supportive responses like texting a best friend.
@@ -66,21 +83,15 @@ class BestFriendAgent:
             Dict: Response with status and casual bestie reply
         """
         payload = envelope.get("payload", {})
-        text = payload.get("text", "")
+        text = payload.get("text", "").strip()
         trace_id = envelope.get("meta", {}).get("trace_id")
+
+        # Nothing to react to - skip the LLM round trip
+        if not text:
+            return {"status": "ok", "reply": self._fallback_reply(text)}
         
         # Create a bestie-style conversational prompt
-        prompt = f"""You are my BEST FRIEND chatting casually. I just said: "{text}"
-
-Respond like texting your bestie:
-- Use 2-4 emojis naturally 💕✨😊
-- Be casual ("omg", "aww", "yesss", "honestly", "literally")
-- Keep it brief (1-3 sentences)
-- React naturally - be supportive, excited, or empathetic
-- Chat and flow naturally - don't ask follow-up questions
-- Sound like a text message, not formal
-
-Just vibe with the conversation!"""
+        prompt = self._prompt(text)
         
         try:
             # Get bestie response from LLM
@@ -100,6 +111,32 @@ Just vibe with the conversation!"""
                 extra={"error": str(e), "trace_id": trace_id}
             )
         
-        # Fallback to bestie reply
-        reply = f"aww bestie 💕 i'm here for you always! {text[:80]}... i totally get it 🫂"
-        return {"status": "ok", "reply": reply}
+        return {"status": "ok", "reply": self._fallback_reply(text)}
+
+    def handle_batch(self, envelopes: List[Dict]) -> List[Dict]:
+        """Answer several envelopes with concurrent per-envelope LLM calls.
+
+        Results are returned in the same order as `envelopes`.
+        """
+        if len(envelopes) <= 1:
+            return [self.handle(envelope) for envelope in envelopes]
+        texts = [envelope.get("payload", {}).get("text", "").strip() for envelope in envelopes]
+        prompted = [text for text in texts if text]
+        replies: List[str] = []
+        if prompted:
+            try:
+                replies = self.llm.generate_batch([self._prompt(text) for text in prompted])
+            except Exception as e:
+                self._logger.warning("bestfriend_batch_failed", extra={"error": str(e)})
+        reply_iter = iter(replies)
+        results = []
+        for text in texts:
+            reply = next(reply_iter, "") if text else ""
+            results.append({"status": "ok", "reply": reply or self._fallback_reply(text)})
+        return results
+
+    def _fallback_reply(self, text: str) -> str:
+        return _FALLBACK_TEMPLATE.format(text[:80])
+
+    def _prompt(self, text: str) -> str:
+        return _PROMPT_PREFIX + text[:MAX_PROMPT_TEXT_CHARS] + _PROMPT_SUFFIX
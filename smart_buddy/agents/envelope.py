@@ -0,0 +1,33 @@
+"""Typed shape of the message envelopes passed between agents.
+
+Envelopes stay plain dicts (they cross HTTP, batching and JSON boundaries,
+and a dict literal is cheaper to build than a slotted dataclass); these
+TypedDicts only describe them for type checkers.
+"""
+
+from typing import Any, Dict, TypedDict
+
+from .intent import IntentPrediction
+
+# "from" is a keyword, so the functional syntax is required here
+EnvelopeMeta = TypedDict("EnvelopeMeta", {"from": str, "to": str, "trace_id": str})
+
+
+class EnvelopePayload(TypedDict, total=False):
+    user_id: str
+    session_id: str
+    text: str
+    intent: IntentPrediction
+
+
+class Envelope(TypedDict):
+    meta: EnvelopeMeta
+    payload: EnvelopePayload
+
+
+class RoutedResult(TypedDict):
+    envelope: Envelope
+    result: Dict[str, Any]
+
+
+__all__ = ["Envelope", "EnvelopeMeta", "EnvelopePayload", "RoutedResult"]
@@ -29,13 +29,120 @@ Handles:
 - Any general queries like ChatGPT
 """
 
-from typing import Dict, Optional, List
+from typing import Dict, Final, Iterator, Optional, List, Tuple
 from datetime import datetime, timedelta
 import json
+import asyncio
+import operator
 
+try:  # optional: faster parsing of the EVENT_CREATED/TASK_CREATED payloads
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json fallback
+    orjson = None
+
+from smart_buddy.conversation import ConversationContext
 from smart_buddy.memory import MemoryBank
 from smart_buddy.logging import get_logger
 from smart_buddy.llm import LLM
+from smart_buddy.response_cache import ResponseCache, is_cacheable_reply
+from smart_buddy.agents.intent import keyword_set
+from smart_buddy.batching import submit_envelopes
+
+# MemoryBank namespaces: per-user lists and the counters their IDs come from
+TASKS_NS: Final = "tasks"
+EVENTS_NS: Final = "events"
+TASK_IDS_NS: Final = "task_ids"
+EVENT_IDS_NS: Final = "event_ids"
+
+_CALENDAR_KEYWORDS = keyword_set("schedule", "calendar", "event", "appointment", "meeting", "remind me", "set reminder")
+_TASK_KEYWORDS = keyword_set("todo", "task", "add task", "create task", "need to do")
+_EVENT_LIST_KEYWORDS = keyword_set("show", "list", "what", "my events", "my calendar")
+_TASK_ADD_KEYWORDS = keyword_set("add", "create", "new task", "need to", "have to", "should do", "remember to")
+_TASK_LIST_KEYWORDS = keyword_set("show", "list", "what", "my tasks", "view tasks", "see tasks")
+
+# Row formatters for the "show my events/tasks" replies
+_EVENT_ROW = "{}. {} - {} at {}".format
+_EVENT_FIELDS = operator.itemgetter("title", "date", "time")
+_TASK_ROW = "{}. {}".format
+
+# Prompt templates, filled with {"text": <user message>}
+_EVENT_PROMPT = """You're a helpful assistant. User wants to schedule something: "{text}"
+
+Extract any details mentioned and create the event. Be smart:
+- If they say "tomorrow" or "Friday" → use that as date
+- If they mention a time → use it
+- If no time given → assume "all day" or a reasonable time
+- Title: extract what they want to do
+
+ONLY ask if BOTH date AND activity are completely unclear. Otherwise, make reasonable assumptions.
+
+If you can create the event, output: EVENT_CREATED: {{"title": "...", "date": "...", "time": "..."}}
+If truly unclear, ask ONE brief question for the most critical missing piece.
+
+Be conversational and flowing, not interrogative.""".format_map
+
+_TASK_PROMPT = """You're a helpful assistant. User wants to add a task: "{text}"
+
+Extract the task description from what they said. Be understanding:
+- Main task is usually obvious from context
+- Priority/deadline are nice-to-have, not required
+- If they say "by Friday" or "urgent" → note it
+
+If you understand what they want to do, create it: TASK_CREATED: {{"text": "...", "priority": "...", "deadline": "..."}}
+Don't ask questions unless the task itself is completely unclear.
+
+Flow naturally with the conversation.""".format_map
+
+_GENERAL_PROMPT = """You are Smart Buddy, a helpful AI assistant like ChatGPT.
+
+{context}User: {text}
+
+Respond naturally and conversationally like ChatGPT:
+- Answer questions directly and clearly
+- Provide explanations, help, advice as needed
+- Generate content when asked (schedules, plans, summaries, etc.)
+- Be friendly but not overly enthusiastic
+- Don't ask unnecessary questions - give useful responses
+- If creating schedules/plans, format them nicely with structure
+- Flow with the conversation naturally
+
+Just respond helpfully to what they asked.""".format_map
+
+
+def _marker_object(text: str, marker: str) -> Optional[str]:
+    """Return the ``{...}`` right after `marker` in `text`.
+
+    None if the marker is missing, not followed by an object, or the object
+    is still incomplete (braces are counted outside JSON strings).
+    """
+    idx = text.find(marker)
+    if idx < 0:
+        return None
+    start = idx + len(marker)
+    while start < len(text) and text[start].isspace():
+        start += 1
+    if start >= len(text) or text[start] != "{":
+        return None
+    depth = 0
+    in_string = escaped = False
+    for pos in range(start, len(text)):
+        ch = text[pos]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+    return None
 
 
 class GeneralAgent:
@@ -46,8 +153,6 @@ class GeneralAgent:
     
     Attributes:
         memory (MemoryBank): Shared memory instance for persistent data storage
-        _tasks_ns (str): Namespace for task storage in memory ("tasks")
-        _events_ns (str): Namespace for event storage in memory ("events")
         llm (LLM): Language model interface for generating responses
     """
     def __init__(
@@ -55,11 +160,15 @@ class GeneralAgent:
     ):
         # memory may be injected for testing; otherwise create a file-backed DB
         self.memory = memory or MemoryBank(db_path)
-        # namespaces for different data types
-        self._tasks_ns = "tasks"
-        self._events_ns = "events"
         self._logger = get_logger(__name__)
-        self.llm = LLM()
+        self.llm = LLM.get_default()
+        # general replies by prompt, persisted across restarts
+        self._responses = ResponseCache(memory=self.memory)
+        # EVENT_CREATED/TASK_CREATED extractions: in-process and short-lived,
+        # so a bad extraction or a prompt/model change does not stick
+        self._extractions = ResponseCache(maxsize=256, ttl=300)
+        # bounded summary + recent turns, so general replies see earlier messages
+        self._conversation = ConversationContext(self.memory, self.llm, namespace="convo_general")
 
     def handle(self, envelope: Dict) -> Dict:
         """Main entry point for processing user messages with intelligent routing.
@@ -101,31 +210,116 @@ class GeneralAgent:
 
         text_lower = text.lower()
         
-        # Retrieve current user data from persistent memory
-        # These are loaded fresh on each request to ensure consistency
-        tasks = self.memory.get(self._tasks_ns, user, [], trace_id=trace_id) or []
-        events = self.memory.get(self._events_ns, user, [], trace_id=trace_id) or []
-        
         # INTENT DETECTION & ROUTING
         # Using keyword-based detection for transparency and simplicity
-        
+        # User data is only loaded by the branches that use it
+        
+        route = self._detect_route(text_lower)
+        if route == "calendar":
+            events = self.memory.list_all(EVENTS_NS, user, trace_id=trace_id)
+            return self._handle_calendar_event(user, text, text_lower, events, trace_id)
+        elif route == "task":
+            tasks = self.memory.list_all(TASKS_NS, user, trace_id=trace_id)
+            return self._handle_task_management(user, text, text_lower, tasks, trace_id)
+        else:
+            convo_key = ConversationContext.key(user, payload.get("session_id"))
+            return self._handle_general_conversation(user, text, trace_id, convo_key)
+
+    async def handle_async(self, envelope: Dict) -> Dict:
+        """Awaitable `handle` that runs the blocking LLM and SQLite work in a worker thread."""
+        return await asyncio.to_thread(self.handle, envelope)
+
+    def handle_stream(self, envelope: Dict) -> Iterator[str]:
+        """Streaming variant of `handle` that yields reply text as it arrives.
+
+        Only general conversation is streamed token by token. Calendar and task
+        requests need the complete LLM output to parse the EVENT_CREATED /
+        TASK_CREATED markers before persisting, so their reply is yielded whole.
+        """
+        payload = envelope.get("payload", {})
+        user = payload.get("user_id", "u1")
+        text = payload.get("text", "")
+        trace_id = envelope.get("meta", {}).get("trace_id")
+
+        if self._detect_route(text.lower()) != "general":
+            yield self.handle(envelope).get("reply", "")
+            return
+
+        extra_base = {"user": user, "text_preview": text[:200]}
+        if trace_id:
+            extra_base["trace_id"] = trace_id
+        self._logger.info("general_handle_stream", extra=extra_base)
+
+        convo_key = ConversationContext.key(user, payload.get("session_id"))
+        prompt = self._general_prompt(text, self._conversation.render(convo_key))
+        chunks: List[str] = []
+        try:
+            for chunk in self.llm.generate_stream(prompt, trace_id=trace_id):
+                if chunk:
+                    chunks.append(chunk)
+                    yield chunk
+        except Exception as e:
+            self._logger.error("general_conversation_stream_error", extra={"error": str(e)})
+        if chunks:
+            self._conversation.record(convo_key, text, "".join(chunks))
+        else:
+            yield "I'm here to help! What would you like to know?"
+
+    def handle_batch(self, envelopes: List[Dict]) -> List[Dict]:
+        """Handle several envelopes, running general-conversation LLM calls concurrently.
+
+        Calendar and task requests read and write per-user memory, so each goes
+        through `handle` on its own thread, alongside the batched general
+        replies; results keep the order of `envelopes`.
+        """
+        results: List[Optional[Dict]] = [None] * len(envelopes)
+        batched: List[int] = []
+        singles: List[int] = []
+        for idx, envelope in enumerate(envelopes):
+            text = envelope.get("payload", {}).get("text", "")
+            (batched if self._detect_route(text.lower()) == "general" else singles).append(idx)
+        pending = submit_envelopes(self.handle, [envelopes[idx] for idx in singles])
+
+        if len(batched) == 1:
+            results[batched[0]] = self.handle(envelopes[batched[0]])
+        elif batched:
+            payloads = [envelopes[idx].get("payload", {}) for idx in batched]
+            keys = [ConversationContext.key(p.get("user_id", "u1"), p.get("session_id")) for p in payloads]
+            prompts = [
+                self._general_prompt(p.get("text", ""), self._conversation.render(key))
+                for p, key in zip(payloads, keys)
+            ]
+            try:
+                replies = self.llm.generate_batch(prompts)
+            except Exception as e:
+                self._logger.error("general_conversation_batch_error", extra={"error": str(e)})
+                replies = [""] * len(batched)
+            for idx, payload, key, reply in zip(batched, payloads, keys, replies):
+                if reply:
+                    self._conversation.record(key, payload.get("text", ""), reply)
+                results[idx] = {"status": "ok", "reply": reply or "I'm here to help! What would you like to know?"}
+        for idx, future in zip(singles, pending):
+            results[idx] = future.result()
+        return results  # type: ignore[return-value]
+
+    def _detect_route(self, text_lower: str) -> str:
+        """Map a lowercased message to "calendar", "task" or "general"."""
         # CALENDAR EVENT MANAGEMENT
         # Keywords: schedule, calendar, event, appointment, meeting, remind me
         # Handles: Creating events, listing calendar, event management
-        if any(keyword in text_lower for keyword in ["schedule", "calendar", "event", "appointment", "meeting", "remind me", "set reminder"]):
-            return self._handle_calendar_event(user, text, events, trace_id)
+        if _CALENDAR_KEYWORDS.matches(text_lower):
+            return "calendar"
         
         # TODO/TASK MANAGEMENT  
         # Keywords: todo, task, add task, create task, need to do
         # Handles: Creating tasks, listing todos, task management
-        elif any(keyword in text_lower for keyword in ["todo", "task", "add task", "create task", "need to do"]):
-            return self._handle_task_management(user, text, tasks, trace_id)
+        elif _TASK_KEYWORDS.matches(text_lower):
+            return "task"
         
         # GENERAL CONVERSATION (like ChatGPT)
-        else:
-            return self._handle_general_conversation(user, text, tasks, events, trace_id)
+        return "general"
     
-    def _handle_calendar_event(self, user: str, text: str, events: List, trace_id: str) -> Dict:
+    def _handle_calendar_event(self, user: str, text: str, text_lower: str, events: List, trace_id: str) -> Dict:
         """Handle calendar event creation and management with smart context extraction.
         
         Design Philosophy:
@@ -150,6 +344,7 @@ class GeneralAgent:
         Args:
             user (str): User identifier for memory storage
             text (str): User's original message
+            text_lower (str): `text` lowercased once by `handle`
             events (List): Current list of user's events from memory
             trace_id (str): Request trace ID for logging
         
@@ -157,58 +352,40 @@ class GeneralAgent:
             Dict: Response with status, events list, and reply message
                   On creation: includes "action": "event_created"
         """
-        text_lower = text.lower()
-        
         # Check if listing events
-        if any(word in text_lower for word in ["show", "list", "what", "my events", "my calendar"]):
+        if _EVENT_LIST_KEYWORDS.matches(text_lower):
             if not events:
                 return {"status": "ok", "events": [], "reply": "📅 Your calendar is empty right now."}
             
-            event_list = "\n".join([f"{i+1}. {e['title']} - {e['date']} at {e['time']}" for i, e in enumerate(events)])
+            event_list = "\n".join(_EVENT_ROW(i, *_EVENT_FIELDS(e)) for i, e in enumerate(events, 1))
             return {"status": "ok", "events": events, "reply": f"📅 Here are your scheduled events:\n\n{event_list}"}
         
         # Create new event - extract what you can, only ask for critical missing info
-        prompt = f"""You're a helpful assistant. User wants to schedule something: "{text}"
-
-Extract any details mentioned and create the event. Be smart:
-- If they say "tomorrow" or "Friday" → use that as date
-- If they mention a time → use it
-- If no time given → assume "all day" or a reasonable time
-- Title: extract what they want to do
-
-ONLY ask if BOTH date AND activity are completely unclear. Otherwise, make reasonable assumptions.
-
-If you can create the event, output: EVENT_CREATED: {{"title": "...", "date": "...", "time": "..."}}
-If truly unclear, ask ONE brief question for the most critical missing piece.
-
-Be conversational and flowing, not interrogative."""
+        prompt = _EVENT_PROMPT({"text": text})
         
         try:
-            result = self.llm.generate(prompt)
-            if result and result.get("candidates"):
-                reply = result["candidates"][0].get("content", "").strip()
-                
+            reply, event_data = self._extract_cached(prompt, "EVENT_CREATED:")
+            if reply is not None:
                 # Check if event was created
-                if "EVENT_CREATED:" in reply:
+                if event_data is not None:
                     try:
-                        json_str = reply.split("EVENT_CREATED:")[1].strip()
-                        event_data = json.loads(json_str)
-                        event_data["id"] = len(events) + 1
+                        # seeded from the list length for users whose events predate the counter
+                        event_data["id"] = self.memory.incr(EVENT_IDS_NS, user, start=len(events), trace_id=trace_id)
+                        self.memory.append(EVENTS_NS, user, event_data, trace_id=trace_id)
                         events.append(event_data)
-                        self.memory.set(self._events_ns, user, events, trace_id=trace_id)
                         return {"status": "ok", "action": "event_created", "events": events, 
                                 "reply": f"✅ Got it! Added to your calendar:\n\n📅 {event_data['title']}\n📆 {event_data['date']} at {event_data['time']}"}
-                    except:
-                        pass
+                    except Exception as e:
+                        self._logger.warning("event_create_failed", extra={"error": repr(e), "trace_id": trace_id})
                 
                 return {"status": "ok", "events": events, "reply": reply}
-        except:
-            pass
+        except Exception as e:
+            self._logger.warning("calendar_generation_failed", extra={"error": str(e), "trace_id": trace_id})
         
         return {"status": "ok", "events": events, 
                 "reply": "I can help schedule that. When would you like it?"}
     
-    def _handle_task_management(self, user: str, text: str, tasks: List, trace_id: str) -> Dict:
+    def _handle_task_management(self, user: str, text: str, text_lower: str, tasks: List, trace_id: str) -> Dict:
         """Handle todo list management with intelligent task extraction.
         
         Design Philosophy:
@@ -233,6 +410,7 @@ Be conversational and flowing, not interrogative."""
         Args:
             user (str): User identifier for memory storage
             text (str): User's original message  
+            text_lower (str): `text` lowercased once by `handle`
             tasks (List): Current list of user's tasks from memory
             trace_id (str): Request trace ID for logging
         
@@ -240,49 +418,31 @@ Be conversational and flowing, not interrogative."""
             Dict: Response with status, tasks list, and reply message
                   On creation: includes "action": "task_created"
         """
-        text_lower = text.lower()
-        
         # Check if this is an ADD request first (higher priority)
-        add_keywords = ["add", "create", "new task", "need to", "have to", "should do", "remember to"]
-        is_adding = any(keyword in text_lower for keyword in add_keywords)
+        is_adding = _TASK_ADD_KEYWORDS.matches(text_lower)
         
         # Check if listing tasks (only if NOT adding)
-        list_keywords = ["show", "list", "what", "my tasks", "view tasks", "see tasks"]
-        is_listing = any(word in text_lower for word in list_keywords) and not is_adding
+        is_listing = not is_adding and _TASK_LIST_KEYWORDS.matches(text_lower)
         
         if is_listing:
             if not tasks:
                 return {"status": "ok", "tasks": [], "reply": "📝 Your todo list is empty right now."}
             
-            task_list = "\n".join([f"{i+1}. {t['text']}" for i, t in enumerate(tasks)])
+            task_list = "\n".join(_TASK_ROW(i, t["text"]) for i, t in enumerate(tasks, 1))
             return {"status": "ok", "tasks": tasks, "reply": f"📝 Your todo list:\n\n{task_list}"}
         
         # Create new task - extract and create immediately if clear
-        prompt = f"""You're a helpful assistant. User wants to add a task: "{text}"
-
-Extract the task description from what they said. Be understanding:
-- Main task is usually obvious from context
-- Priority/deadline are nice-to-have, not required
-- If they say "by Friday" or "urgent" → note it
-
-If you understand what they want to do, create it: TASK_CREATED: {{"text": "...", "priority": "...", "deadline": "..."}}
-Don't ask questions unless the task itself is completely unclear.
-
-Flow naturally with the conversation."""
+        prompt = _TASK_PROMPT({"text": text})
         
         try:
-            result = self.llm.generate(prompt)
-            if result and result.get("candidates"):
-                reply = result["candidates"][0].get("content", "").strip()
-                
+            reply, task_data = self._extract_cached(prompt, "TASK_CREATED:")
+            if reply is not None:
                 # Check if task was created
-                if "TASK_CREATED:" in reply:
+                if task_data is not None:
                     try:
-                        json_str = reply.split("TASK_CREATED:")[1].strip()
-                        task_data = json.loads(json_str)
-                        task_data["id"] = len(tasks) + 1
+                        task_data["id"] = self.memory.incr(TASK_IDS_NS, user, start=len(tasks), trace_id=trace_id)
+                        self.memory.append(TASKS_NS, user, task_data, trace_id=trace_id)
                         tasks.append(task_data)
-                        self.memory.set(self._tasks_ns, user, tasks, trace_id=trace_id)
                         
                         task_str = f"✅ Added: {task_data['text']}"
                         if task_data.get("priority"):
@@ -291,16 +451,18 @@ Flow naturally with the conversation."""
                             task_str += f" - Due: {task_data['deadline']}"
                         
                         return {"status": "ok", "action": "task_created", "tasks": tasks, "reply": task_str}
-                    except:
-                        pass
+                    except Exception as e:
+                        self._logger.warning("task_create_failed", extra={"error": repr(e), "trace_id": trace_id})
                 
                 return {"status": "ok", "tasks": tasks, "reply": reply}
-        except:
-            pass
+        except Exception as e:
+            self._logger.warning("task_generation_failed", extra={"error": str(e), "trace_id": trace_id})
         
         return {"status": "ok", "tasks": tasks, "reply": "Got it, I'll add that to your list."}
     
-    def _handle_general_conversation(self, user: str, text: str, tasks: List, events: List, trace_id: str) -> Dict:
+    def _handle_general_conversation(
+        self, user: str, text: str, trace_id: str, convo_key: Optional[str] = None
+    ) -> Dict:
         """Handle general ChatGPT-like conversation for all other queries.
         
         Design Philosophy:
@@ -319,6 +481,7 @@ Flow naturally with the conversation."""
         
         Implementation:
             - Constructs prompt positioning as "Smart Buddy" assistant
+            - Prepends the conversation summary and recent turns for `convo_key`
             - Sends user query to LLM (Google Gemini)
             - Returns generated response directly
             - Falls back to friendly default on LLM failure
@@ -326,37 +489,70 @@ Flow naturally with the conversation."""
         Args:
             user (str): User identifier (not used in general conversation)
             text (str): User's question or message
-            tasks (List): User's tasks (available for context if needed)
-            events (List): User's events (available for context if needed)
             trace_id (str): Request trace ID for logging
+            convo_key (str): Conversation key (user:session); None sends no history
         
         Returns:
             Dict: Response with status and reply message from LLM
         """
-        
-        prompt = f"""You are Smart Buddy, a helpful AI assistant like ChatGPT.
-
-User: {text}
-
-Respond naturally and conversationally like ChatGPT:
-- Answer questions directly and clearly
-- Provide explanations, help, advice as needed
-- Generate content when asked (schedules, plans, summaries, etc.)
-- Be friendly but not overly enthusiastic
-- Don't ask unnecessary questions - give useful responses
-- If creating schedules/plans, format them nicely with structure
-- Flow with the conversation naturally
-
-Just respond helpfully to what they asked."""
+        context = self._conversation.render(convo_key) if convo_key else ""
+        prompt = self._general_prompt(text, context)
         
         try:
-            result = self.llm.generate(prompt)
-            if result and result.get("candidates"):
-                reply = result["candidates"][0].get("content", "").strip()
-                if reply:
-                    return {"status": "ok", "reply": reply}
+            # prompts with history never repeat, so keep them out of llm_cache
+            reply = self._responses.generate(self.llm, prompt, persist=not context)
+            if reply:
+                if convo_key:
+                    self._conversation.record(convo_key, text, reply)
+                return {"status": "ok", "reply": reply}
         except Exception as e:
             self._logger.error(f"general_conversation_error", extra={"error": str(e)})
         
         return {"status": "ok", "reply": "I'm here to help! What would you like to know?"}
 
+    def _extract_cached(self, prompt: str, marker: str) -> Tuple[Optional[str], Optional[Dict]]:
+        """Return ``(reply, marker_json)`` for a creation prompt, cached by prompt.
+
+        The parsed JSON after `marker` is cached alongside the reply so a hit
+        skips both the LLM call and the parse. `reply` is None when the LLM
+        returned nothing; the JSON is a fresh copy the caller may mutate.
+        """
+        cached = self._extractions.get(prompt)
+        if cached is None:
+            reply = self._stream_until_marker(prompt, marker)
+            if reply is None:
+                return None, None
+            data = None
+            obj = _marker_object(reply, marker)
+            if obj is not None:
+                try:
+                    data = orjson.loads(obj) if orjson is not None else json.loads(obj)
+                except ValueError:  # orjson.JSONDecodeError subclasses ValueError
+                    data = None
+            cached = {"reply": reply, "data": data if isinstance(data, dict) else None}
+            if is_cacheable_reply(reply):
+                self._extractions.set(prompt, cached)
+        data = cached.get("data")
+        return cached.get("reply", ""), dict(data) if data is not None else None
+
+    def _stream_until_marker(self, prompt: str, marker: str) -> Optional[str]:
+        """Stream the reply to `prompt`, stopping once `marker` and its JSON are complete.
+
+        The text after the JSON object is never shown on the creation path,
+        so the stream is closed as soon as the object balances. Returns the
+        stripped text received, or None when the LLM produced nothing.
+        """
+        stream = self.llm.generate_stream(prompt)
+        buf = ""
+        try:
+            for chunk in stream:
+                buf += chunk
+                if _marker_object(buf, marker) is not None:
+                    break
+        finally:
+            stream.close()
+        return buf.strip() or None
+
+    def _general_prompt(self, text: str, context: str = "") -> str:
+        return _GENERAL_PROMPT({"text": text, "context": context})
+
@@ -2,10 +2,48 @@
 This agent demonstrates intent classification used by the Router.
 """
 
-from typing import Optional, TypedDict
+from typing import Optional, Tuple, TypedDict
 from smart_buddy.logging import get_logger
 
 
+class KeywordSet:
+    """Fixed keyword group matched as plain substrings of lowercased text.
+
+    Equivalent to ``any(k in text for k in keywords)`` (no word boundaries,
+    so "anx" still matches "anxious"). Each test is CPython's C substring
+    search; keep it that way rather than compiling the group into a regex
+    alternation, which is ~3x slower on long pasted inputs.
+    """
+
+    __slots__ = ("keywords",)
+
+    def __init__(self, keywords: Tuple[str, ...]) -> None:
+        self.keywords = keywords
+
+    def matches(self, text_lower: str) -> bool:
+        return any(map(text_lower.__contains__, self.keywords))
+
+
+def keyword_set(*keywords: str) -> KeywordSet:
+    """Build a KeywordSet, dropping keywords that can never change the result.
+
+    Duplicates go, and so does any keyword containing another one ("add
+    task" is implied by "task"), so each call scans the text fewer times.
+    """
+    unique = tuple(dict.fromkeys(keywords))
+    kept = tuple(k for k in unique if not any(o != k and o in k for o in unique))
+    return KeywordSet(kept)
+
+
+_MENTOR_KEYWORDS = keyword_set(
+    "teach", "explain", "learn", "what is", "how does", "advice", "suggest",
+    "plan", "roadmap", "problem", "stuck", "review", "feedback",
+)
+_TASK_KEYWORDS = keyword_set("task", "todo", "remind", "reminder", "add event", "schedule", "calendar")
+_EMOTION_KEYWORDS = keyword_set("sad", "stress", "anx", "feel", "upset", "depress", "lonely", "happy", "excited")
+_SUMMARY_KEYWORDS = keyword_set("summary", "summarize", "tl;dr", "summ")
+
+
 class IntentPrediction(TypedDict):
     intent: str
     confidence: str
@@ -24,16 +62,13 @@ class IntentAgent:
         t = text.lower()
         intent: IntentPrediction
         # Mentor mode: teaching, learning, advice, planning, problem-solving, review
-        if any(k in t for k in ("teach", "explain", "learn", "what is", "how does", "advice", "suggest", "plan", "roadmap", "problem", "stuck", "review", "feedback")):
+        if _MENTOR_KEYWORDS.matches(t):
             intent = {"intent": "planner", "confidence": "0.9"}
-        elif any(k in t for k in ("task", "todo", "remind", "reminder", "add event", "schedule", "calendar")):
+        elif _TASK_KEYWORDS.matches(t):
             intent = {"intent": "task", "confidence": "0.9"}
-        elif any(
-            k in t
-            for k in ("sad", "stress", "anx", "feel", "upset", "depress", "lonely", "happy", "excited")
-        ):
+        elif _EMOTION_KEYWORDS.matches(t):
             intent = {"intent": "emotion", "confidence": "0.9"}
-        elif any(k in t for k in ("summary", "summarize", "tl;dr", "summ")):
+        elif _SUMMARY_KEYWORDS.matches(t):
             intent = {"intent": "summary", "confidence": "0.8"}
         else:
             intent = {"intent": "general", "confidence": "0.6"}
@@ -27,12 +27,102 @@ Behavior:
     - Provides warm, supportive general mentoring for casual queries
 """
 
+import asyncio
 import time
-from typing import Dict, Optional
+from typing import Dict, Final, Iterator, List, Optional, Tuple
 
 from smart_buddy.memory import MemoryBank
 from smart_buddy.logging import get_logger
 from smart_buddy.llm import LLM
+from smart_buddy.response_cache import ResponseCache
+from smart_buddy.conversation import ConversationContext
+from smart_buddy.agents.intent import keyword_set
+from smart_buddy.batching import submit_envelopes
+
+
+MENTOR_NS: Final = "mentor"  # MemoryBank namespace for each user's saved plan
+_PLAN_SAVED_NOTE = "\n\n✓ Plan saved! Type 'show my plan' anytime to review."
+
+# Checked in order; the first mode whose keywords appear in the text wins
+_MODE_KEYWORDS = (
+    ("teaching", keyword_set("explain", "teach", "what is", "how does", "understand", "learn", "concept")),
+    ("advice", keyword_set("advice", "suggest", "recommend", "should i", "what do you think", "opinion")),
+    ("planning", keyword_set("plan", "roadmap", "steps", "how to", "guide", "prepare")),
+    ("problem_solving", keyword_set("problem", "stuck", "help", "don't know", "confused", "issue")),
+    ("reviewing", keyword_set("review", "feedback", "check", "correct", "improve", "better")),
+)
+_SAVED_KEYWORDS = keyword_set("show", "view", "see", "my plan", "saved")
+
+_TEACHING_PROMPT = """You are an excellent teacher explaining: "{text}"
+
+Teach clearly and effectively:
+- Break down concepts simply
+- Use real-world examples and analogies
+- Structure: concept → example → key takeaway
+- Be thorough but not overwhelming (3-5 paragraphs)
+
+Just explain it well. Don't ask follow-up questions unless necessary.""".format_map
+
+_ADVICE_PROMPT = """You are a wise mentor giving advice on: "{text}"
+
+Provide direct, thoughtful guidance:
+- Consider perspectives and trade-offs
+- Give actionable suggestions
+- Be supportive but realistic
+- Structure clearly (2-4 paragraphs)
+
+Give the advice directly. Don't ask for more details unless critical.""".format_map
+
+_PLANNING_PROMPT = """You are a strategic mentor creating a plan for: "{text}"
+
+Create a detailed, actionable roadmap:
+- 6-10 specific, numbered steps
+- Include timeframes and milestones
+- Make steps achievable and concrete
+- Add brief tips for each step
+
+Just create the plan. Don't ask for more context.""".format_map
+
+_PROBLEM_SOLVING_PROMPT = """You are a problem-solving mentor. Issue: "{text}"
+
+Provide problem-solving guidance:
+- Identify the core issue
+- Break into manageable parts
+- Offer practical solutions
+- Be analytical and clear (2-4 paragraphs)
+
+Give solutions directly. Don't interrogate about the problem.""".format_map
+
+_REVIEWING_PROMPT = """You are a mentor reviewing work: "{text}"
+
+Provide constructive review:
+- Acknowledge strengths
+- Point out improvement areas with specifics
+- Give actionable suggestions
+- Be encouraging and balanced (2-3 paragraphs)
+
+Provide the review directly. Don't ask for more context unless absolutely needed.""".format_map
+
+_GENERAL_PROMPT = """You are a supportive mentor. {context}Student said: "{text}"
+
+Respond naturally and helpfully:
+- Understand what they're asking or sharing
+- Provide relevant insights or support
+- Be conversational and warm (1-3 sentences)
+- Give substantive responses, not just questions
+
+Flow naturally with the conversation.""".format_map
+
+# mode -> (prompt builder, reply header, fallback reply); builders take
+# {"text": ..., "context": ...} and only the general prompt uses the context
+_MODE_PROMPTS = {
+    "teaching": (_TEACHING_PROMPT, "📚 **Teaching Mode**\n\n", "📚 I'll explain that for you right away."),
+    "advice": (_ADVICE_PROMPT, "💡 **Mentor's Advice**\n\n", "💡 Here's my guidance on that..."),
+    "planning": (_PLANNING_PROMPT, "🗺️ **Your Personalized Roadmap**\n\n", "🗺️ Let me create a roadmap for you..."),
+    "problem_solving": (_PROBLEM_SOLVING_PROMPT, "🔍 **Problem-Solving Mode**\n\n", "🔍 Let me help you work through this..."),
+    "reviewing": (_REVIEWING_PROMPT, "✍️ **Review & Feedback**\n\n", "✍️ I'll review that for you..."),
+    "general": (_GENERAL_PROMPT, "", "I'm here to help guide you. Let's talk about that."),
+}
 
 
 class MentorAgent:
@@ -43,7 +133,6 @@ class MentorAgent:
     
     Attributes:
         memory (MemoryBank): Shared memory for storing plans and user progress
-        _ns (str): Namespace for mentor data in memory ("mentor")
         llm (LLM): Language model interface for generating mentoring responses
     """
     def __init__(
@@ -51,9 +140,10 @@ class MentorAgent:
     ):
         # allow injection for tests
         self.memory = memory or MemoryBank(db_path)
-        self._ns = "mentor"
         self._logger = get_logger(__name__)
-        self.llm = LLM()
+        self.llm = LLM.get_default()
+        self._responses = ResponseCache(memory=self.memory)
+        self._conversation = ConversationContext(self.memory, self.llm, namespace="convo_mentor")
 
     def handle(self, envelope: Dict) -> Dict:
         """Main entry point for mentor interactions with intelligent mode detection.
@@ -90,160 +180,168 @@ class MentorAgent:
             extra_base["trace_id"] = trace_id
         self._logger.info("mentor_handle_start", extra=extra_base)
 
-        # Check if there's existing saved content
-        saved_content = self.memory.get(self._ns, user, trace_id=trace_id)
+        # Determine the type of mentoring needed (saved content is only
+        # loaded when the text could be asking to view it)
+        mode, saved_content = self._select_mode(text, user, trace_id)
         
-        # Determine the type of mentoring needed
-        is_teaching = any(word in text.lower() for word in ["explain", "teach", "what is", "how does", "understand", "learn", "concept"])
-        is_advice = any(word in text.lower() for word in ["advice", "suggest", "recommend", "should i", "what do you think", "opinion"])
-        is_planning = any(word in text.lower() for word in ["plan", "roadmap", "steps", "how to", "guide", "prepare"])
-        is_problem_solving = any(word in text.lower() for word in ["problem", "stuck", "help", "don't know", "confused", "issue"])
-        is_reviewing = any(word in text.lower() for word in ["review", "feedback", "check", "correct", "improve", "better"])
-        
-        # TEACHING MODE - Explain concepts clearly
-        if is_teaching:
-            prompt = f"""You are an excellent teacher explaining: "{text}"
+        # VIEW SAVED CONTENT
+        if mode == "saved":
+            content = saved_content.get('content', '')
+            topic = saved_content.get('topic', 'your previous request')
+            return {"status": "ok", "reply": f"📋 **Saved Plan: {topic}**\n\n{content}"}
 
-Teach clearly and effectively:
-- Break down concepts simply
-- Use real-world examples and analogies
-- Structure: concept → example → key takeaway
-- Be thorough but not overwhelming (3-5 paragraphs)
+        convo_key = ConversationContext.key(user, payload.get("session_id"))
+        return self._run_mode(mode, user, text, trace_id, convo_key)
 
-Just explain it well. Don't ask follow-up questions unless necessary."""
-            
-            try:
-                result = self.llm.generate(prompt)
-                if result and result.get("candidates"):
-                    reply = result["candidates"][0].get("content", "").strip()
-                    if reply:
-                        return {"status": "ok", "reply": f"📚 **Teaching Mode**\n\n{reply}"}
-            except:
-                pass
-            
-            return {"status": "ok", "reply": "📚 I'll explain that for you right away."}
-        
-        # ADVICE/SUGGESTION MODE
-        elif is_advice:
-            prompt = f"""You are a wise mentor giving advice on: "{text}"
+    async def handle_async(self, envelope: Dict) -> Dict:
+        """Awaitable `handle` that runs the blocking LLM and SQLite work in a worker thread."""
+        return await asyncio.to_thread(self.handle, envelope)
 
-Provide direct, thoughtful guidance:
-- Consider perspectives and trade-offs
-- Give actionable suggestions
-- Be supportive but realistic
-- Structure clearly (2-4 paragraphs)
+    def handle_stream(self, envelope: Dict) -> Iterator[str]:
+        """Streaming variant of `handle` that yields the reply as it is generated.
 
-Give the advice directly. Don't ask for more details unless critical."""
-            
-            try:
-                result = self.llm.generate(prompt)
-                if result and result.get("candidates"):
-                    reply = result["candidates"][0].get("content", "").strip()
-                    if reply:
-                        return {"status": "ok", "reply": f"💡 **Mentor's Advice**\n\n{reply}"}
-            except:
-                pass
-            
-            return {"status": "ok", "reply": "💡 Here's my guidance on that..."}
-        
-        # PLANNING/ROADMAP MODE
-        elif is_planning:
-            prompt = f"""You are a strategic mentor creating a plan for: "{text}"
+        The mode header is emitted together with the first chunk so a failed
+        generation never leaves a dangling header. In planning mode the chunks
+        are accumulated and the full plan is persisted once the stream ends;
+        in general mode the finished turn is added to the conversation context.
+        """
+        payload = envelope.get("payload", {})
+        user = payload.get("user_id", "u1")
+        text = payload.get("text", "")
+        trace_id = envelope.get("meta", {}).get("trace_id")
+        extra_base = {"user": user, "text_preview": text[:200]}
+        if trace_id:
+            extra_base["trace_id"] = trace_id
+        self._logger.info("mentor_handle_stream_start", extra=extra_base)
 
-Create a detailed, actionable roadmap:
-- 6-10 specific, numbered steps
-- Include timeframes and milestones
-- Make steps achievable and concrete
-- Add brief tips for each step
+        mode, _ = self._select_mode(text, user, trace_id)
+        if mode == "saved":
+            yield self.handle(envelope).get("reply", "")
+            return
+
+        convo_key = None
+        context = ""
+        if mode == "general":
+            convo_key = ConversationContext.key(user, payload.get("session_id"))
+            context = self._conversation.render(convo_key)
+        prompt, header, fallback = self._mode_prompt(mode, text, context)
+        chunks: List[str] = []
+        try:
+            for chunk in self.llm.generate_stream(prompt, trace_id=trace_id):
+                if not chunk:
+                    continue
+                yield f"{header}{chunk}" if not chunks else chunk
+                chunks.append(chunk)
+        except Exception as e:
+            self._logger.warning("mentor_stream_failed", extra={"error": str(e), "trace_id": trace_id})
+
+        if not chunks:
+            yield fallback
+            return
+        if convo_key:
+            self._conversation.record(convo_key, text, "".join(chunks))
+        if mode == "planning":
+            plan_content = "".join(chunks).strip()
+            if plan_content:
+                self._save_plan(user, text, plan_content, trace_id)
+                yield _PLAN_SAVED_NOTE
+
+    def handle_batch(self, envelopes: List[Dict]) -> List[Dict]:
+        """Handle several envelopes, running conversational-mode LLM calls concurrently.
+
+        Planning replies are persisted and saved-plan views read memory, so
+        each of those goes through `handle` on its own thread, alongside the
+        batched replies. Results keep input order.
+        """
+        results: List[Optional[Dict]] = [None] * len(envelopes)
+        singles: List[int] = []
+        # (index, prompt, header, fallback, text, convo_key or None)
+        batched: List[Tuple[int, str, str, str, str, Optional[str]]] = []
+        for idx, envelope in enumerate(envelopes):
+            payload = envelope.get("payload", {})
+            text = payload.get("text", "")
+            user = payload.get("user_id", "u1")
+            mode, _ = self._select_mode(text, user)
+            if mode in ("planning", "saved"):
+                singles.append(idx)
+                continue
+            convo_key = None
+            context = ""
+            if mode == "general":
+                convo_key = ConversationContext.key(user, payload.get("session_id"))
+                context = self._conversation.render(convo_key)
+            batched.append((idx, *self._mode_prompt(mode, text, context), text, convo_key))
+        pending = submit_envelopes(self.handle, [envelopes[idx] for idx in singles])
 
-Just create the plan. Don't ask for more context."""
-            
+        if len(batched) == 1:
+            results[batched[0][0]] = self.handle(envelopes[batched[0][0]])
+        elif batched:
             try:
-                result = self.llm.generate(prompt)
-                if result and result.get("candidates"):
-                    plan_content = result["candidates"][0].get("content", "").strip()
-                    if plan_content:
-                        # Save the plan
-                        plan_data = {"content": plan_content, "topic": text, "done": True}
-                        self.memory.set(self._ns, user, plan_data, trace_id=trace_id)
-                        
-                        return {"status": "completed", "plan": plan_data, "reply": f"🗺️ **Your Personalized Roadmap**\n\n{plan_content}\n\n✓ Plan saved! Type 'show my plan' anytime to review."}
+                replies = self.llm.generate_batch([item[1] for item in batched])
             except Exception as e:
-                self._logger.warning("mentor_planning_failed", extra={"error": str(e), "trace_id": trace_id})
-            
-            return {"status": "ok", "reply": "🗺️ Let me create a roadmap for you..."}
-        
-        # PROBLEM-SOLVING MODE
-        elif is_problem_solving:
-            prompt = f"""You are a problem-solving mentor. Issue: "{text}"
+                self._logger.warning("mentor_batch_failed", extra={"error": str(e)})
+                replies = [""] * len(batched)
+            for (idx, _, header, fallback, text, convo_key), reply in zip(batched, replies):
+                if reply and convo_key:
+                    self._conversation.record(convo_key, text, reply)
+                results[idx] = {"status": "ok", "reply": f"{header}{reply}" if reply else fallback}
+        for idx, future in zip(singles, pending):
+            results[idx] = future.result()
+        return results  # type: ignore[return-value]
 
-Provide problem-solving guidance:
-- Identify the core issue
-- Break into manageable parts
-- Offer practical solutions
-- Be analytical and clear (2-4 paragraphs)
+    def _select_mode(
+        self, text: str, user: str, trace_id: Optional[str] = None
+    ) -> Tuple[str, Optional[Dict]]:
+        """Return ``(mode, saved_content)`` for `text`; the first matching mode wins.
 
-Give solutions directly. Don't interrogate about the problem."""
-            
-            try:
-                result = self.llm.generate(prompt)
-                if result and result.get("candidates"):
-                    reply = result["candidates"][0].get("content", "").strip()
-                    if reply:
-                        return {"status": "ok", "reply": f"🔍 **Problem-Solving Mode**\n\n{reply}"}
-            except:
-                pass
-            
-            return {"status": "ok", "reply": "🔍 Let me help you work through this..."}
-        
-        # REVIEW/FEEDBACK MODE
-        elif is_reviewing:
-            prompt = f"""You are a mentor reviewing work: "{text}"
+        The user's saved plan is read from memory only when no prompt mode
+        matched and the text asks to show/view something, so most turns
+        skip the lookup; `saved_content` is None whenever it was not read.
+        """
+        text_lower = text.lower()
+        for mode, keywords in _MODE_KEYWORDS:
+            if keywords.matches(text_lower):
+                return mode, None
+        if _SAVED_KEYWORDS.matches(text_lower):
+            saved_content = self.memory.get(MENTOR_NS, user, trace_id=trace_id)
+            if saved_content:
+                return "saved", saved_content
+        return "general", None
 
-Provide constructive review:
-- Acknowledge strengths
-- Point out improvement areas with specifics
-- Give actionable suggestions
-- Be encouraging and balanced (2-3 paragraphs)
+    def _run_mode(
+        self, mode: str, user: str, text: str, trace_id: Optional[str], convo_key: Optional[str] = None
+    ) -> Dict:
+        """Generate the reply for a prompt-driven mode (everything except "saved").
 
-Provide the review directly. Don't ask for more context unless absolutely needed."""
-            
-            try:
-                result = self.llm.generate(prompt)
-                if result and result.get("candidates"):
-                    reply = result["candidates"][0].get("content", "").strip()
-                    if reply:
-                        return {"status": "ok", "reply": f"✍️ **Review & Feedback**\n\n{reply}"}
-            except:
-                pass
-            
-            return {"status": "ok", "reply": "✍️ I'll review that for you..."}
-        
-        # VIEW SAVED CONTENT
-        elif saved_content and any(word in text.lower() for word in ["show", "view", "see", "my plan", "saved"]):
-            content = saved_content.get('content', '')
-            topic = saved_content.get('topic', 'your previous request')
-            return {"status": "ok", "reply": f"📋 **Saved Plan: {topic}**\n\n{content}"}
-        
-        # GENERAL MENTORING CONVERSATION
-        else:
-            prompt = f"""You are a supportive mentor. Student said: "{text}"
+        The single place LLM failures are caught and logged; the mode's
+        fallback reply is returned instead. Planning also persists the plan.
+        General mode carries the conversation context for `convo_key`.
+        """
+        context = ""
+        if mode == "general" and convo_key:
+            context = self._conversation.render(convo_key)
+        prompt, header, fallback = self._mode_prompt(mode, text, context)
+        try:
+            # prompts with history never repeat, so keep them out of llm_cache
+            reply = self._responses.generate(self.llm, prompt, persist=not context)
+            if reply:
+                if mode == "general" and convo_key:
+                    self._conversation.record(convo_key, text, reply)
+                if mode == "planning":
+                    plan_data = self._save_plan(user, text, reply, trace_id)
+                    return {"status": "completed", "plan": plan_data, "reply": f"{header}{reply}{_PLAN_SAVED_NOTE}"}
+                return {"status": "ok", "reply": f"{header}{reply}"}
+        except Exception as e:
+            self._logger.warning("mentor_mode_failed", extra={"mode": mode, "error": str(e), "trace_id": trace_id})
 
-Respond naturally and helpfully:
-- Understand what they're asking or sharing
-- Provide relevant insights or support
-- Be conversational and warm (1-3 sentences)
-- Give substantive responses, not just questions
+        return {"status": "ok", "reply": fallback}
 
-Flow naturally with the conversation."""
-            
-            try:
-                result = self.llm.generate(prompt)
-                if result and result.get("candidates"):
-                    reply = result["candidates"][0].get("content", "").strip()
-                    if reply:
-                        return {"status": "ok", "reply": reply}
-            except:
-                pass
-            
-            return {"status": "ok", "reply": "I'm here to help guide you. Let's talk about that."}
+    def _save_plan(self, user: str, text: str, plan_content: str, trace_id: Optional[str]) -> Dict:
+        plan_data = {"content": plan_content, "topic": text, "done": True}
+        self.memory.set(MENTOR_NS, user, plan_data, trace_id=trace_id)
+        return plan_data
+
+    def _mode_prompt(self, mode: str, text: str, context: str = "") -> Tuple[str, str, str]:
+        """Return ``(prompt, reply_header, fallback_reply)`` for a mentoring mode."""
+        build, header, fallback = _MODE_PROMPTS.get(mode, _MODE_PROMPTS["general"])
+        return build({"text": text, "context": context}), header, fallback
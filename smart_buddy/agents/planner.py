@@ -7,14 +7,64 @@ from __future__ import annotations
 
 import time
 import uuid
-from typing import Dict, List, Optional, Any
+from functools import cached_property
+from itertools import cycle, islice
+from typing import Dict, List, Optional, Any, Tuple
 
 from smart_buddy.memory import MemoryBank
 from smart_buddy.logging import get_logger
+from smart_buddy.trace_ids import new_trace_id
 
 # LLM kept for future prompts; current implementation uses deterministic fallback
 from smart_buddy.llm import LLM
-from smart_buddy.tools import build_default_registry
+from smart_buddy.tools import ToolRegistry, build_default_registry
+from smart_buddy.tools.calendar import CalendarTool
+from smart_buddy.tools.docs import DocumentLookupTool
+from smart_buddy.tools.web import CuratedWebSearchTool
+from smart_buddy.agents.intent import keyword_set
+
+# Plan scaffolding, one per step (repeating past eight); only the goal varies
+_SCAFFOLDS = (
+    "Clarify success criteria",
+    "Research constraints",
+    "Design approach",
+    "Prototype or pilot",
+    "Measure outcomes",
+    "Iterate and scale",
+    "Document learnings",
+    "Share results",
+)
+_STEP_ACTIONS = tuple(f"{scaffold} for the goal: {{}}.".format for scaffold in _SCAFFOLDS)
+_STEP_SUCCESS = "Evidence of progress captured in notes and metrics."
+
+# Goals mentioning these get a deeper plan
+_COMPLEXITY_TRIGGERS = keyword_set(
+    "roadmap", "launch", "strategy", "architecture", "curriculum", "campaign", "research", "bootcamp",
+)
+# Tool selection, checked in this order: docs and metrics fire when the step's
+# action (scaffold + goal) matches, the calendar hold when the goal does
+_DOCS_TRIGGERS = keyword_set("research", "document")
+_METRICS_TRIGGERS = keyword_set("measure", "monitor", "scan")
+_SCHEDULE_TRIGGERS = keyword_set("schedule", "calendar", "onboard")
+# No trigger spans the " for the goal: " joint, so a step's tool follows from
+# its scaffold (fixed here) and the goal (scanned once per plan)
+_SCAFFOLD_TOOLS = tuple(
+    DocumentLookupTool.name if _DOCS_TRIGGERS.matches(scaffold.lower())
+    else CuratedWebSearchTool.name if _METRICS_TRIGGERS.matches(scaffold.lower())
+    else None
+    for scaffold in _SCAFFOLDS
+)
+
+
+def _goal_tool(goal_lower: str) -> Optional[str]:
+    """Tool the goal alone would trigger on every step, if any."""
+    if _DOCS_TRIGGERS.matches(goal_lower):
+        return DocumentLookupTool.name
+    if _METRICS_TRIGGERS.matches(goal_lower):
+        return CuratedWebSearchTool.name
+    if _SCHEDULE_TRIGGERS.matches(goal_lower):
+        return CalendarTool.name
+    return None
 
 
 class PlannerAgent:
@@ -28,8 +78,16 @@ class PlannerAgent:
         self.memory = memory or MemoryBank(db_path)
         self._ns = "planner_runs"
         self._logger = get_logger(__name__)
-        self.llm = LLM()
-        self.tools = build_default_registry(memory=self.memory)
+
+    # Built on first use: drafting is deterministic, and resume/error paths
+    # return before any tool runs
+    @cached_property
+    def llm(self) -> LLM:
+        return LLM.get_default()
+
+    @cached_property
+    def tools(self) -> ToolRegistry:
+        return build_default_registry(memory=self.memory)
 
     # ------------------------------------------------------------------
     # Public API
@@ -40,7 +98,7 @@ class PlannerAgent:
         session_id = payload.get("session_id", "session")
         goal = (payload.get("text") or "").strip()
         intent_payload = payload.get("intent") or {}
-        trace_id = envelope.get("meta", {}).get("trace_id") or str(uuid.uuid4())
+        trace_id = envelope.get("meta", {}).get("trace_id") or new_trace_id()
 
         if not goal:
             return {
@@ -64,28 +122,34 @@ class PlannerAgent:
                 ),
             }
 
-        depth_cfg = self._determine_depth(intent_payload, goal)
-        timeline: List[Dict[str, Any]] = []
-        timeline.append(self._timeline_entry(
-            stage="depth", summary=f"level={depth_cfg['level']} steps={depth_cfg['steps']}", trace_id=trace_id
-        ))
+        goal_lower = goal.lower()
+        depth_cfg = self._determine_depth(intent_payload, goal, goal_lower)
+        # (stage, summary, timestamp) per stage; turned into the timeline and
+        # logged as one record once the plan is complete
+        stages: List[Tuple[str, str, float]] = []
+        stages.append(("depth", f"level={depth_cfg['level']} steps={depth_cfg['steps']}", time.time()))
 
         plan_steps = self._draft_plan(goal, depth_cfg, trace_id)
-        timeline.append(self._timeline_entry(
-            stage="plan", summary=f"drafted {len(plan_steps)} steps", trace_id=trace_id
-        ))
+        stages.append(("plan", f"drafted {len(plan_steps)} steps", time.time()))
 
         execution_log, tool_calls = self._execute_plan(
-            plan_steps, depth_cfg, trace_id, user_id, session_id, goal
+            plan_steps, depth_cfg, trace_id, user_id, session_id, goal, goal_lower
         )
-        timeline.append(self._timeline_entry(
-            stage="execute", summary=f"logged {len(execution_log)} execution notes", trace_id=trace_id
-        ))
+        stages.append(("execute", f"logged {len(execution_log)} execution notes", time.time()))
 
         reflection = self._reflect(plan_steps, execution_log, depth_cfg, trace_id)
-        timeline.append(self._timeline_entry(
-            stage="reflect", summary=reflection[:160], trace_id=trace_id
-        ))
+        stages.append(("reflect", reflection[:160], time.time()))
+
+        timeline = [
+            {"stage": stage, "summary": summary, "timestamp": ts} for stage, summary, ts in stages
+        ]
+        self._logger.info(
+            "planner_stages",
+            extra={
+                "trace_id": trace_id,
+                "stages": [(stage, summary[:120]) for stage, summary, _ in stages],
+            },
+        )
 
         plan_state = {
             "plan_id": str(uuid.uuid4()),
@@ -109,21 +173,13 @@ class PlannerAgent:
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _determine_depth(self, intent_payload: Dict[str, Any], goal: str) -> Dict[str, Any]:
-        text = goal.lower()
+    def _determine_depth(
+        self, intent_payload: Dict[str, Any], goal: str, goal_lower: Optional[str] = None
+    ) -> Dict[str, Any]:
+        text = goal_lower if goal_lower is not None else goal.lower()
         base_steps = 4
-        complexity_triggers = [
-            "roadmap",
-            "launch",
-            "strategy",
-            "architecture",
-            "curriculum",
-            "campaign",
-            "research",
-            "bootcamp",
-        ]
         level = "standard"
-        if len(goal.split()) > 40 or any(word in text for word in complexity_triggers):
+        if len(goal.split()) > 40 or _COMPLEXITY_TRIGGERS.matches(text):
             base_steps = 6
             level = "deep"
         confidence = intent_payload.get("confidence", 0)
@@ -137,37 +193,14 @@ class PlannerAgent:
             "reflection_prompts": 2 if level != "standard" else 1,
         }
 
-    def _timeline_entry(self, stage: str, summary: str, trace_id: str) -> Dict[str, Any]:
-        entry = {"stage": stage, "summary": summary, "timestamp": time.time()}
-        self._logger.info(
-            "planner_stage",
-            extra={"stage": stage, "summary": summary, "trace_id": trace_id},
-        )
-        return entry
-
     def _draft_plan(
         self, goal: str, depth_cfg: Dict[str, Any], trace_id: str
     ) -> List[Dict[str, Any]]:
         steps = depth_cfg.get("steps", 4)
-        scaffolding = [
-            "Clarify success criteria",
-            "Research constraints",
-            "Design approach",
-            "Prototype or pilot",
-            "Measure outcomes",
-            "Iterate and scale",
-            "Document learnings",
-            "Share results",
+        return [
+            {"step": n, "action": action(goal), "success": _STEP_SUCCESS, "status": "planned"}
+            for n, action in zip(range(1, steps + 1), cycle(_STEP_ACTIONS))
         ]
-        plan_steps: List[Dict[str, Any]] = []
-        for idx in range(steps):
-            scaffold = scaffolding[idx % len(scaffolding)]
-            action = f"{scaffold} for the goal: {goal}."
-            success = "Evidence of progress captured in notes and metrics."
-            plan_steps.append(
-                {"step": idx + 1, "action": action, "success": success, "status": "planned"}
-            )
-        return plan_steps
 
     def _execute_plan(
         self,
@@ -177,30 +210,39 @@ class PlannerAgent:
         user_id: str,
         session_id: str,
         goal: str,
+        goal_lower: Optional[str] = None,
     ) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        execution_log: List[Dict[str, Any]] = []
-        tool_calls: List[Dict[str, Any]] = []
-        for step in plan_steps:
-            note = (
-                f"Validated step {step['step']} by defining deliverables and aligning them with the goal."
-            )
-            execution_log.append(
-                {
-                    "step": step["step"],
-                    "action": step["action"],
-                    "result": note,
-                    "status": "completed",
-                }
-            )
-            tool_entry = self._maybe_call_tool(
+        if goal_lower is None:
+            goal_lower = goal.lower()
+        # the notes are fixed text, so the log is built in one pass up front
+        execution_log: List[Dict[str, Any]] = [
+            {
+                "step": step["step"],
+                "action": step["action"],
+                "result": f"Validated step {step['step']} by defining deliverables and aligning them with the goal.",
+                "status": "completed",
+            }
+            for step in plan_steps
+        ]
+        goal_tool = _goal_tool(goal_lower)
+        # steps come from _draft_plan, so the i-th scaffold matches step i; a docs
+        # goal outranks every scaffold, otherwise the scaffold's own tool wins
+        if goal_tool == DocumentLookupTool.name:
+            step_tools = [goal_tool] * len(plan_steps)
+        else:
+            step_tools = [tool or goal_tool for tool in islice(cycle(_SCAFFOLD_TOOLS), len(plan_steps))]
+        tool_calls: List[Dict[str, Any]] = [
+            self._call_tool(
                 step,
                 goal,
+                tool_name,
                 user_id=user_id,
                 session_id=session_id,
                 trace_id=trace_id,
             )
-            if tool_entry:
-                tool_calls.append(tool_entry)
+            for step, tool_name in zip(plan_steps, step_tools)
+            if tool_name is not None
+        ]
         self._logger.info(
             "planner_execution_log",
             extra={
@@ -229,44 +271,28 @@ class PlannerAgent:
         )
         return summary
 
-    def _maybe_call_tool(
+    def _call_tool(
         self,
         step: Dict[str, Any],
         goal: str,
+        tool_name: str,
         *,
         user_id: str,
         session_id: str,
         trace_id: str,
-    ) -> Optional[Dict[str, Any]]:
-        action_text = step.get("action", "").lower()
-        goal_text = goal.lower()
-        intent: Optional[Dict[str, Any]] = None
-        if "research" in action_text or "document" in action_text:
-            intent = {
-                "name": "docs.lookup",
-                "arguments": {"query": goal[:160]},
-            }
-        elif any(word in action_text for word in ("measure", "monitor", "scan")):
-            intent = {
-                "name": "web.search",
-                "arguments": {"query": goal.split()[0], "tag": "metrics"},
-            }
-        elif any(word in goal_text for word in ("schedule", "calendar", "onboard")):
-            intent = {
-                "name": "calendar.manage",
-                "arguments": {
-                    "action": "add_hold",
-                    "title": goal[:60],
-                },
-            }
-        if not intent:
-            return None
+    ) -> Dict[str, Any]:
+        if tool_name == DocumentLookupTool.name:
+            arguments: Dict[str, Any] = {"query": goal[:160]}
+        elif tool_name == CuratedWebSearchTool.name:
+            arguments = {"query": goal.split()[0], "tag": "metrics"}
+        else:
+            arguments = {"action": "add_hold", "title": goal[:60]}
         result = self.tools.call(
-            intent["name"],
+            tool_name,
             user_id=user_id,
             session_id=session_id,
             trace_id=f"{trace_id}:{step['step']}",
-            arguments=intent["arguments"],
+            arguments=arguments,
         )
         entry = {
             "step": step["step"],
@@ -282,10 +308,9 @@ class PlannerAgent:
         return entry
 
     def _format_response(self, plan_state: Dict[str, Any]) -> str:
-        bullet_lines = []
-        for step in plan_state.get("steps", [])[:4]:
-            bullet_lines.append(f"{step['step']}. {step['action']}")
-        bullets = "\n".join(bullet_lines)
+        bullets = "\n".join(
+            [f"{step['step']}. {step['action']}" for step in plan_state.get("steps", [])[:4]]
+        )
         reflection = plan_state.get("reflection", "Plan created.")
         return (
             "🧭 **Multi-Step Plan Created**\n\n"
@@ -31,16 +31,23 @@ Behavior:
     6. Return agent response with envelope metadata
 """
 
-import uuid
-from typing import Dict
+import asyncio
+import logging
+import time
 from smart_buddy.logging import get_logger
+from smart_buddy.memory import MemoryBank, shared_write_queue
+from smart_buddy.trace_ids import new_trace_id
 
+from .envelope import Envelope, RoutedResult
 from .intent import IntentAgent
 from .general_agent import GeneralAgent
 from .mentor import MentorAgent
 from .bestfriend import BestFriendAgent
 from .planner import PlannerAgent
 
+# intent -> agent that handles it; anything else is answered by the router
+_DISPATCH_TARGETS = {"task": "general", "planner": "planner", "emotion": "bestfriend"}
+
 
 class RouterAgent:
     """Central orchestrator routing messages to specialized agents via intent.
@@ -60,13 +67,25 @@ class RouterAgent:
         # memory can be a MemoryBank instance shared across agents
         self.intent = IntentAgent()
         self.memory = memory
-        # defer importing MemoryBank to avoid cyclic import issues in some setups
-        self.general = GeneralAgent(memory=memory)
-        self.mentor = MentorAgent(memory=memory)
+        # Without an injected bank the sub-agents share one in-memory
+        # MemoryBank, so nothing is written to the working directory;
+        # session footprints still need an explicit `memory`.
+        shared = memory if memory is not None else MemoryBank(":memory:")
+        self.general = GeneralAgent(memory=shared)
+        self.mentor = MentorAgent(memory=shared)
         self.bestfriend = BestFriendAgent()
-        self.planner = PlannerAgent(memory=memory)
+        self.planner = PlannerAgent(memory=shared)
+        # intent -> bound handle(), keyed like _DISPATCH_TARGETS
+        self._handlers = {
+            "task": self.general.handle,
+            "planner": self.planner.handle,
+            "emotion": self.bestfriend.handle,
+        }
+        # session footprints are write-only telemetry, so they are written behind
+        # by the process-wide writer (one thread however many routers exist)
+        self._session_writes = shared_write_queue() if memory is not None else None
 
-    def route(self, user_id: str, session_id: str, text: str) -> Dict:
+    def route(self, user_id: str, session_id: str, text: str) -> RoutedResult:
         """Route user message to appropriate agent based on intent classification.
         
         Routing Process:
@@ -102,22 +121,26 @@ class RouterAgent:
             text (str): User's message text
         
         Returns:
-            Dict: Contains envelope (metadata) and result (agent response)
+            RoutedResult: Contains envelope (metadata) and result (agent response)
         """
+        start_ns = time.perf_counter_ns()
         # Generate UUID for request tracing across agents
-        trace_id = str(uuid.uuid4())
+        trace_id = new_trace_id()
         # include trace_id when classifying so downstream logs can be correlated
         intent = self.intent.classify(text, trace_id=trace_id)
-        self._logger.info(
-            "route_received",
-            extra={
-                "user_id": user_id,
-                "session_id": session_id,
-                "intent": intent,
-                "trace_id": trace_id,
-            },
-        )
-        envelope = {
+        # checked once so the DEBUG records' extras are only built when emitted
+        debug = self._logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self._logger.debug(
+                "route_received",
+                extra={
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "intent": intent,
+                    "trace_id": trace_id,
+                },
+            )
+        envelope: Envelope = {
             "meta": {"from": "router", "to": intent["intent"], "trace_id": trace_id},
             "payload": {
                 "user_id": user_id,
@@ -128,19 +151,11 @@ class RouterAgent:
         }
 
         to = intent["intent"]
-        if to == "task":
-            self._logger.debug("dispatch", extra={"to": "general", "trace_id": trace_id})
-            result = self.general.handle(envelope)
-        elif to == "planner":
-            self._logger.debug(
-                "dispatch", extra={"to": "planner", "trace_id": trace_id}
-            )
-            result = self.planner.handle(envelope)
-        elif to == "emotion":
-            self._logger.debug(
-                "dispatch", extra={"to": "bestfriend", "trace_id": trace_id}
-            )
-            result = self.bestfriend.handle(envelope)
+        handler = self._handlers.get(to)
+        if handler is not None:
+            if debug:
+                self._logger.debug("dispatch", extra={"to": _DISPATCH_TARGETS[to], "trace_id": trace_id})
+            result = handler(envelope)
         else:
             result = {
                 "status": "ok",
@@ -150,7 +165,8 @@ class RouterAgent:
         # Optionally record a lightweight session footprint in the MemoryBank (if provided)
         try:
             if self.memory:
-                self.memory.set(
+                self._session_writes.submit(
+                    self.memory,
                     "sessions",
                     session_id,
                     {"user_id": user_id, "intent": intent},
@@ -175,7 +191,25 @@ class RouterAgent:
                 "route_session_record_failed", extra={"trace_id": trace_id}
             )
 
+        # The router's one INFO record per request; look for "route_summary"
+        # (route_received and dispatch are DEBUG)
         self._logger.info(
-            "route_completed", extra={"trace_id": trace_id, "result": result}
+            "route_summary",
+            extra={
+                "trace_id": trace_id,
+                "user_id": user_id,
+                "session_id": session_id,
+                "received_intent": to,
+                "dispatched_to": _DISPATCH_TARGETS.get(to, "router"),
+                "completed_status": result.get("status"),
+                "latency_us": (time.perf_counter_ns() - start_ns) // 1000,
+            },
         )
         return {"envelope": envelope, "result": result}
+
+    async def route_async(self, user_id: str, session_id: str, text: str) -> RoutedResult:
+        """Awaitable `route` that runs the blocking agent work in a worker thread.
+
+        Lets callers overlap independent requests with ``asyncio.gather``.
+        """
+        return await asyncio.to_thread(self.route, user_id, session_id, text)
@@ -1,20 +1,55 @@
-"""Centralized audit trail for moderation, memory, and tool events."""
+"""Centralized audit trail for moderation, memory, and tool events.
+
+`record` numbers the event and enqueues it; a background flusher thread
+stores events in batches and emits one log line per batch, so agents never
+wait on the readers' lock or on logging. Readers call `flush` first, so a
+caller always sees the events it has recorded. A forked child starts its own
+flusher.
+"""
 from __future__ import annotations
 
+import os
+import queue
 import threading
 import time
-from collections import deque
+import weakref
+from collections import Counter, deque
+from itertools import count, islice
 from typing import Any, Deque, Dict, List, Optional
 
 from smart_buddy.logging import get_logger
 
+_MAX_BATCH = 256
+
+# every trail, so a forked child can replace threads and locks it inherited
+_TRAILS: "weakref.WeakSet[AuditTrail]" = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for trail in list(_TRAILS):
+        trail._reset_threads()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 
 class AuditTrail:
     def __init__(self, max_events: int = 500) -> None:
-        self._lock = threading.Lock()
         self._events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
-        self._next_id = 1
+        self._ids = count(1)
         self._logger = get_logger("smart_buddy.audit")
+        self._reset_threads()
+        _TRAILS.add(self)
+
+    def _reset_threads(self) -> None:
+        self._lock = threading.Lock()
+        # held only to draw an ID and enqueue, so queue order matches ID order
+        self._record_lock = threading.Lock()
+        # events (and flush() markers) waiting for the flusher thread
+        self._pending: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._flusher: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
 
     def record(
         self,
@@ -24,29 +59,41 @@ class AuditTrail:
         severity: str = "info",
         payload: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        with self._lock:
-            event = {
-                "id": self._next_id,
-                "event_type": event_type,
-                "trace_id": trace_id or "unknown",
-                "severity": severity,
-                "payload": payload or {},
-                "timestamp": time.time(),
-                "status": "open",
-                "notes": [],
-            }
-            self._events.appendleft(event)
-            self._next_id += 1
-        self._logger.info(
-            "audit_event",
-            extra={"event_type": event_type, "trace_id": trace_id, "severity": severity},
-        )
+        """Queue an event and return it with its ``id`` already assigned."""
+        event = {
+            "id": None,
+            "event_type": event_type,
+            "trace_id": trace_id or "unknown",
+            "severity": severity,
+            "payload": payload or {},
+            "timestamp": time.time(),
+            "status": "open",
+            "notes": [],
+        }
+        if self._flusher is None:
+            self._start_flusher()
+        with self._record_lock:
+            event["id"] = next(self._ids)
+            self._pending.put(event)
         return event
 
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every event recorded before this call is stored."""
+        if self._flusher is None:
+            return
+        done = threading.Event()
+        self._pending.put(done)
+        if not done.wait(timeout):
+            self._logger.warning("audit_flush_timeout", extra={"timeout": timeout})
+
     def override(self, event_id: int, note: str, actor: str = "manual") -> bool:
+        self.flush()
         with self._lock:
+            # newest first with increasing ids, so stop once past event_id
             for event in self._events:
-                if event["id"] == event_id:
+                if event["id"] <= event_id:
+                    if event["id"] != event_id:
+                        break
                     event["status"] = "overridden"
                     event["notes"].append({"actor": actor, "note": note, "timestamp": time.time()})
                     self._logger.info("audit_override", extra={"event_id": event_id, "actor": actor})
@@ -54,15 +101,60 @@ class AuditTrail:
         return False
 
     def list_events(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        self.flush()
         with self._lock:
-            events = list(self._events)
-        if limit is not None:
-            return events[:limit]
-        return events
+            if limit is not None:
+                return list(islice(self._events, max(limit, 0)))
+            return list(self._events)
 
     def export(self) -> List[Dict[str, Any]]:
         return self.list_events()
 
+    def _start_flusher(self) -> None:
+        with self._start_lock:
+            if self._flusher is None:
+                thread = threading.Thread(target=self._flush_loop, name="audit-flusher", daemon=True)
+                thread.start()
+                self._flusher = thread
+
+    def _flush_loop(self) -> None:
+        while True:
+            batch: List[Dict[str, Any]] = []
+            markers: List[threading.Event] = []
+            item = self._pending.get()
+            while True:
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= _MAX_BATCH:
+                    break
+                try:
+                    item = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                if batch:
+                    self._store(batch)
+            except Exception:
+                self._logger.exception("audit_flush_failed")
+            finally:
+                for marker in markers:
+                    marker.set()
+
+    def _store(self, batch: List[Dict[str, Any]]) -> None:
+        # readers iterate the deque, so only the insert itself is locked
+        with self._lock:
+            self._events.extendleft(batch)
+        self._logger.info(
+            "audit_event_batch",
+            extra={
+                "count": len(batch),
+                "event_types": dict(Counter(e["event_type"] for e in batch)),
+                "trace_ids": sorted({e["trace_id"] for e in batch}),
+            },
+        )
+
 
 audit_trail = AuditTrail()
 
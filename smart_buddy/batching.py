@@ -0,0 +1,124 @@
+"""Request coalescing for concurrent chat traffic.
+
+`ChatBatcher` collects envelopes submitted within a short window and hands
+them to an agent's `handle_batch` in one call, so N concurrent users cost one
+worker-thread hop instead of N. Agents answer each envelope with its own LLM
+call (run concurrently by `LLM.generate_batch`); users' prompts are never
+combined. One batcher is used per agent mode, and each batch is dispatched as
+its own task, so collecting the next batch never waits on the previous one.
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from smart_buddy.logging import get_logger
+
+MAX_BATCH_SIZE = 8
+MAX_WAIT_SECONDS = 0.005
+
+# Runs the envelopes an agent's handle_batch cannot fold into one
+# generate_batch call (calendar, task, planning), so they overlap each other
+# and the batched call instead of running one after another
+_ENVELOPE_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="chat-envelope")
+
+
+def submit_envelopes(
+    handle: Callable[[Dict[str, Any]], Dict[str, Any]], envelopes: List[Dict[str, Any]]
+) -> List[Future]:
+    """Start `handle(envelope)` for each envelope on a shared pool, in order."""
+    return [_ENVELOPE_POOL.submit(handle, envelope) for envelope in envelopes]
+
+
+class ChatBatcher:
+    def __init__(
+        self,
+        handle_batch: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        *,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait: float = MAX_WAIT_SECONDS,
+        name: str = "chat",
+    ) -> None:
+        self._handle_batch = handle_batch
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._name = name
+        self._queue: Optional[asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+        self._logger = get_logger(__name__)
+
+    async def submit(self, envelope: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue `envelope` and wait for its result from the next batch."""
+        self._ensure_worker()
+        assert self._queue is not None
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((envelope, future))
+        return await future
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for task in list(self._inflight):
+            task.cancel()
+        self._inflight.clear()
+
+    def _ensure_worker(self) -> None:
+        # The queue and worker are bound to the running loop, so create them lazily
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _collect(self) -> List[Tuple[Dict[str, Any], asyncio.Future]]:
+        assert self._queue is not None
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_wait
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            task = loop.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        envelopes = [envelope for envelope, _ in batch]
+        self._logger.debug(
+            "chat_batch_dispatch", extra={"batcher": self._name, "size": len(batch)}
+        )
+        try:
+            # agents are blocking (LLM + SQLite), keep them off the event loop
+            results = await asyncio.to_thread(self._handle_batch, envelopes)
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"handle_batch returned {len(results)} results for {len(batch)} envelopes"
+                )
+        except Exception as exc:
+            self._logger.exception("chat_batch_failed", extra={"batcher": self._name})
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+__all__ = ["ChatBatcher", "MAX_BATCH_SIZE", "MAX_WAIT_SECONDS", "submit_envelopes"]
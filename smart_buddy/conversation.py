@@ -0,0 +1,122 @@
+"""Rolling, token-bounded conversation context for the chat agents.
+
+Recent turns are kept verbatim per (user, session) in a MemoryBank
+namespace owned by one agent (``"convo_general"``, ``"convo_mentor"``), so
+agents never fold each other's turns. Once they exceed `max_pending_tokens` they
+are folded into a short LLM-written summary on a background thread, so the
+context prepended to a prompt stays bounded no matter how long the
+conversation runs, instead of growing with the full history.
+
+Token counts are estimated at ~4 characters per token; tiktoken is not a
+dependency and the bound only needs to be approximate.
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from smart_buddy.logging import get_logger
+
+NAMESPACE = "convo_summary"
+MAX_PENDING_TOKENS = 2000
+MAX_SUMMARY_CHARS = 1500
+_TURN_CHARS = 600
+
+# Summaries are best-effort background work; two threads are plenty
+_SUMMARY_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="convo-summary")
+
+# Shared by every ConversationContext in the process, so two instances that
+# point at the same (namespace, key) still serialize their read-modify-writes
+_LOCK = threading.Lock()
+_SUMMARIZING: Set[Tuple[str, str]] = set()
+
+_SUMMARY_PROMPT = """Update the running summary of a conversation between a user and an assistant.
+
+Current summary:
+{summary}
+
+New turns:
+{turns}
+
+Write the updated summary in at most 150 words. Keep facts, names, goals and open questions; drop small talk. Output only the summary.""".format_map
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+class ConversationContext:
+    def __init__(
+        self,
+        memory: Any,
+        llm: Any,
+        namespace: str = NAMESPACE,
+        max_pending_tokens: int = MAX_PENDING_TOKENS,
+    ) -> None:
+        self.memory = memory
+        self.llm = llm
+        self.namespace = namespace
+        self.max_pending_tokens = max_pending_tokens
+        self._logger = get_logger(__name__)
+
+    @staticmethod
+    def key(user: str, session_id: Optional[str]) -> str:
+        return f"{user}:{session_id or 'default'}"
+
+    def render(self, key: str) -> str:
+        """Context block to place before the user's message, or "" for a new conversation."""
+        state = self._load(key)
+        parts: List[str] = []
+        if state["summary"]:
+            parts.append(f"Summary of earlier conversation: {state['summary']}")
+        parts.extend(state["pending"])
+        if not parts:
+            return ""
+        return "Conversation so far:\n" + "\n".join(parts) + "\n\n"
+
+    def record(self, key: str, user_text: str, reply: str) -> None:
+        """Append one turn; schedule summarization once the raw turns grow too long."""
+        turn = f"User: {user_text[:_TURN_CHARS]}\nAssistant: {reply[:_TURN_CHARS]}"
+        with _LOCK:
+            state = self._load(key)
+            state["pending"].append(turn)
+            self.memory.set(self.namespace, key, state)
+            over_budget = estimate_tokens("\n".join(state["pending"])) > self.max_pending_tokens
+            if not over_budget or (self.namespace, key) in _SUMMARIZING:
+                return
+            _SUMMARIZING.add((self.namespace, key))
+        _SUMMARY_POOL.submit(self._summarize, key)
+
+    def _load(self, key: str) -> Dict[str, Any]:
+        state = self.memory.get(self.namespace, key) or {}
+        return {"summary": state.get("summary", ""), "pending": list(state.get("pending", []))}
+
+    def _summarize(self, key: str) -> None:
+        try:
+            state = self._load(key)
+            folded = len(state["pending"])
+            prompt = _SUMMARY_PROMPT(
+                {"summary": state["summary"] or "(none)", "turns": "\n".join(state["pending"])}
+            )
+            result = self.llm.generate(prompt)
+            summary = ""
+            if result and result.get("candidates"):
+                summary = (result["candidates"][0].get("content") or "").strip()
+            if not summary:
+                return
+            with _LOCK:
+                # turns recorded while the LLM was busy stay pending
+                current = self._load(key)
+                current["summary"] = summary[:MAX_SUMMARY_CHARS]
+                current["pending"] = current["pending"][folded:]
+                self.memory.set(self.namespace, key, current)
+            self._logger.info("conversation_summarized", extra={"key": key, "turns": folded})
+        except Exception as e:
+            self._logger.warning("conversation_summary_failed", extra={"key": key, "error": str(e)})
+        finally:
+            with _LOCK:
+                _SUMMARIZING.discard((self.namespace, key))
+
+
+__all__ = ["ConversationContext", "estimate_tokens"]
@@ -5,12 +5,20 @@ track readiness inside CI.
 """
 from __future__ import annotations
 
+import heapq
 import json
-import statistics
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import DefaultDict, Dict, List, Any, Optional
+
+try:  # optional: orjson writes reports several times faster
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is the fallback
+    orjson = None
 
 from .scenarios import (
     build_context,
@@ -20,6 +28,11 @@ from .scenarios import (
     ScenarioOutcome,
 )
 
+# history.jsonl keeps every run; the dashboard only needs the recent ones,
+# which are read from the end of the file in blocks of this size
+_HISTORY_LIMIT = 200
+_TAIL_BLOCK = 64 * 1024
+
 
 @dataclass
 class ScenarioResult:
@@ -47,12 +60,53 @@ class EvaluationHarness:
         self.report_dir.mkdir(parents=True, exist_ok=True)
         self.context: EvalContext = build_context()
         self.scenarios: List[EvalScenario] = build_scenarios()
+        # recent history.jsonl rows, kept in step with our own appends; the
+        # (mtime, size) stamp spots writes from other runs
+        self._history_cache: Optional[List[Dict[str, Any]]] = None
+        self._history_stamp: Optional[tuple] = None
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
     def run(self, regression_gates: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
         results = self._execute_scenarios()
+        return self._finish(results, regression_gates)
+
+    def run_parallel(
+        self,
+        regression_gates: Optional[Dict[str, float]] = None,
+        workers: int = 4,
+    ) -> Dict[str, Any]:
+        """Like `run`, but executes each category on its own worker thread.
+
+        Categories are independent (each scenario uses its own user ID), so
+        they share this harness's context: one MemoryBank, one RAG store.
+        Threads overlap the LLM calls of a live run. Worker processes were
+        tried and dropped: each one rebuilt the context, re-ran the RAG
+        bootstrap and opened the same eval DB, taking ~5 s against ~30 ms
+        for the whole suite run serially with the offline LLM.
+        """
+        by_category: Dict[str, List[EvalScenario]] = {}
+        for scenario in self.scenarios:
+            by_category.setdefault(scenario.category, []).append(scenario)
+        if workers <= 1 or len(by_category) <= 1:
+            return self.run(regression_gates)
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(by_category)), thread_name_prefix="eval"
+        ) as pool:
+            batches = list(
+                pool.map(lambda scenarios: _execute(scenarios, self.context), by_category.values())
+            )
+        order = {scenario.id: index for index, scenario in enumerate(self.scenarios)}
+        results = sorted(
+            (result for batch in batches for result in batch),
+            key=lambda r: order.get(r.id, len(order)),
+        )
+        return self._finish(results, regression_gates)
+
+    def _finish(
+        self, results: List[ScenarioResult], regression_gates: Optional[Dict[str, float]]
+    ) -> Dict[str, Any]:
         summary = self._summarize(results)
         self._write_reports(summary, results)
         gate_report = self._check_regressions(summary, regression_gates or {})
@@ -63,57 +117,40 @@ class EvaluationHarness:
     # Scenario execution
     # ------------------------------------------------------------------
     def _execute_scenarios(self) -> List[ScenarioResult]:
-        results: List[ScenarioResult] = []
-        for scenario in self.scenarios:
-            start = time.perf_counter()
-            try:
-                outcome: ScenarioOutcome = scenario.runner(self.context)
-            except Exception as exc:  # pragma: no cover - defensive
-                outcome = ScenarioOutcome(
-                    passed=False,
-                    score=0.0,
-                    max_score=1.0,
-                    details={"error": str(exc)},
-                )
-            latency_ms = (time.perf_counter() - start) * 1000
-            results.append(
-                ScenarioResult(
-                    id=scenario.id,
-                    name=scenario.name,
-                    category=scenario.category,
-                    passed=outcome.passed,
-                    score=outcome.score,
-                    max_score=outcome.max_score,
-                    details=outcome.details,
-                    latency_ms=latency_ms,
-                )
-            )
-        return results
+        return _execute(self.scenarios, self.context)
 
     # ------------------------------------------------------------------
     # Reporting helpers
     # ------------------------------------------------------------------
     def _summarize(self, results: List[ScenarioResult]) -> Dict[str, Any]:
-        total_score = sum(r.score for r in results)
-        max_score = sum(r.max_score for r in results) or 1.0
-        passes = sum(1 for r in results if r.passed)
-        pass_rate = passes / len(results)
-        category_breakdown: Dict[str, Dict[str, Any]] = {}
+        total_score = 0.0
+        max_score = 0.0
+        latencies: List[float] = []
+        # category -> [passed, total, score, max_score]; bools add as 0/1
+        buckets: DefaultDict[str, List[Any]] = defaultdict(lambda: [0, 0, 0.0, 0.0])
         for r in results:
-            bucket = category_breakdown.setdefault(
-                r.category,
-                {"passed": 0, "total": 0, "score": 0.0, "max_score": 0.0},
-            )
-            bucket["total"] += 1
-            bucket["max_score"] += r.max_score
-            bucket["score"] += r.score
-            if r.passed:
-                bucket["passed"] += 1
-        for data in category_breakdown.values():
-            total = data["total"] or 1
-            data["pass_rate"] = data["passed"] / total
-            data["score_pct"] = data["score"] / (data["max_score"] or 1)
-        latencies = [r.latency_ms for r in results]
+            total_score += r.score
+            max_score += r.max_score
+            latencies.append(r.latency_ms)
+            bucket = buckets[r.category]
+            bucket[0] += r.passed
+            bucket[1] += 1
+            bucket[2] += r.score
+            bucket[3] += r.max_score
+        max_score = max_score or 1.0
+        passes = sum(bucket[0] for bucket in buckets.values())
+        pass_rate = passes / len(results)
+        category_breakdown: Dict[str, Dict[str, Any]] = {
+            category: {
+                "passed": passed,
+                "total": total,
+                "score": score,
+                "max_score": cat_max,
+                "pass_rate": passed / (total or 1),
+                "score_pct": score / (cat_max or 1),
+            }
+            for category, (passed, total, score, cat_max) in buckets.items()
+        }
         summary = {
             "timestamp": time.time(),
             "scenario_count": len(results),
@@ -123,7 +160,7 @@ class EvaluationHarness:
             "passed": passes,
             "pass_rate": round(pass_rate, 4),
             "latency_ms": {
-                "mean": round(statistics.mean(latencies), 2) if latencies else 0.0,
+                "mean": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
                 "p95": round(_percentile(latencies, 0.95), 2) if latencies else 0.0,
                 "max": round(max(latencies), 2) if latencies else 0.0,
             },
@@ -136,34 +173,28 @@ class EvaluationHarness:
         history_file = self.report_dir / "history.jsonl"
         dashboard_file = self.report_dir / "dashboard.html"
 
-        latest_json.write_text(json.dumps(summary, indent=2), encoding="utf-8")
-        with history_file.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(summary) + "\n")
+        history = self._load_history()
+        latest_json.write_bytes(_dumps(summary, indent=True))
+        with history_file.open("ab") as handle:
+            handle.write(_dumps(summary) + b"\n")
+        # copy: _finish adds regression_check to summary after the line is written
+        history.append(dict(summary))
+        del history[:-_HISTORY_LIMIT]
+        self._history_stamp = _file_stamp(history_file)
         dashboard_file.write_text(
-            _render_dashboard(summary, self._load_history()),
+            _render_dashboard(summary, history),
             encoding="utf-8",
         )
         results_file = self.report_dir / "scenario_results.json"
-        results_file.write_text(
-            json.dumps([r.to_dict() for r in results], indent=2),
-            encoding="utf-8",
-        )
+        results_file.write_bytes(_dumps([r.to_dict() for r in results], indent=True))
 
     def _load_history(self) -> List[Dict[str, Any]]:
         history_file = self.report_dir / "history.jsonl"
-        if not history_file.exists():
-            return []
-        history: List[Dict[str, Any]] = []
-        with history_file.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    history.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-        return history
+        stamp = _file_stamp(history_file)
+        if self._history_cache is None or stamp != self._history_stamp:
+            self._history_cache = _read_history_tail(history_file) if stamp else []
+            self._history_stamp = stamp
+        return self._history_cache
 
     def _check_regressions(self, summary: Dict[str, Any], gates: Dict[str, float]) -> Dict[str, Any]:
         if not gates:
@@ -180,6 +211,90 @@ class EvaluationHarness:
         return {"status": overall_status, "details": details}
 
 
+# ---------------------------------------------------------------------------
+# Scenario execution helpers
+# ---------------------------------------------------------------------------
+
+def _execute(scenarios: List[EvalScenario], context: EvalContext) -> List[ScenarioResult]:
+    results: List[ScenarioResult] = []
+    for scenario in scenarios:
+        start = time.perf_counter()
+        try:
+            outcome: ScenarioOutcome = scenario.runner(context)
+        except Exception as exc:  # pragma: no cover - defensive
+            outcome = ScenarioOutcome(
+                passed=False,
+                score=0.0,
+                max_score=1.0,
+                details={"error": str(exc)},
+            )
+        latency_ms = (time.perf_counter() - start) * 1000
+        results.append(
+            ScenarioResult(
+                id=scenario.id,
+                name=scenario.name,
+                category=scenario.category,
+                passed=outcome.passed,
+                score=outcome.score,
+                max_score=outcome.max_score,
+                details=outcome.details,
+                latency_ms=latency_ms,
+            )
+        )
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Report file helpers
+# ---------------------------------------------------------------------------
+
+def _file_stamp(path: Path) -> Optional[tuple]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_history_tail(path: Path) -> List[Dict[str, Any]]:
+    """Parse the last `_HISTORY_LIMIT` rows without reading the whole file."""
+    with path.open("rb") as handle:
+        pos = handle.seek(0, os.SEEK_END)
+        tail = b""
+        while pos > 0 and tail.count(b"\n") <= _HISTORY_LIMIT:
+            step = min(_TAIL_BLOCK, pos)
+            pos -= step
+            handle.seek(pos)
+            tail = handle.read(step) + tail
+    lines = tail.split(b"\n")
+    if pos > 0:
+        lines = lines[1:]  # starts mid-row
+    loads = orjson.loads if orjson is not None else json.loads
+    history: List[Dict[str, Any]] = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            history.append(loads(line))
+        except ValueError:  # both libraries' decode errors subclass it
+            continue
+    return history[-_HISTORY_LIMIT:]
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """UTF-8 JSON for the report files, via orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0),
+            )
+        except TypeError:  # e.g. ints beyond 64 bits; json handles them
+            pass
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
 # ---------------------------------------------------------------------------
 # Dashboard rendering helpers
 # ---------------------------------------------------------------------------
@@ -242,8 +357,9 @@ def _render_dashboard(latest: Dict[str, Any], history: List[Dict[str, Any]]) ->
 def _history_js(history: List[Dict[str, Any]]) -> str:
     if not history:
         return "document.getElementById('historyChart').remove();"
-    labels = [time.strftime("%H:%M:%S", time.localtime(row.get("timestamp", 0))) for row in history[-20:]]
-    data = [round(row.get("pass_rate", 0) * 100, 2) for row in history[-20:]]
+    recent = history[-20:]
+    labels = [time.strftime("%H:%M:%S", time.localtime(row.get("timestamp", 0))) for row in recent]
+    data = [round(row.get("pass_rate", 0) * 100, 2) for row in recent]
     return (
         "const ctx = document.getElementById('historyChart').getContext('2d');"
         "new Chart(ctx, {type: 'line', data: {labels: "
@@ -257,9 +373,12 @@ def _history_js(history: List[Dict[str, Any]]) -> str:
 def _percentile(values: List[float], quantile: float) -> float:
     if not values:
         return 0.0
-    values = sorted(values)
+    # select the k-th smallest (0-based) from whichever end is closer, keeping
+    # a heap of min(k + 1, n - k) items instead of sorting everything
     k = int((len(values) - 1) * quantile)
-    return float(values[k])
+    if k < len(values) - k:
+        return float(heapq.nsmallest(k + 1, values)[-1])
+    return float(heapq.nlargest(len(values) - k, values)[-1])
 
 
 __all__ = ["EvaluationHarness", "ScenarioResult"]
@@ -158,17 +158,20 @@ def _planner_runner(
     min_steps: int,
     expected_level: str | None = None,
 ) -> Callable[[EvalContext], ScenarioOutcome]:
+    user_id = f"judge-{scenario_id.lower()}"
+    # the planner only reads the payload, so one copy serves every run
+    payload = {
+        "user_id": user_id,
+        "session_id": f"eval-{scenario_id.lower()}",
+        "text": goal,
+        "intent": {"intent": "planner", "confidence": 0.92},
+    }
+
     def _run(ctx: EvalContext) -> ScenarioOutcome:
-        user_id = f"judge-{scenario_id.lower()}"
         ctx.memory.delete("planner_runs", user_id)
         envelope = {
             "meta": {"from": "eval", "to": "planner", "trace_id": f"eval-{time.time_ns()}"},
-            "payload": {
-                "user_id": user_id,
-                "session_id": f"eval-{scenario_id.lower()}",
-                "text": goal,
-                "intent": {"intent": "planner", "confidence": 0.92},
-            },
+            "payload": payload,
         }
         result = ctx.planner.handle(envelope)
         plan = result.get("plan") or result.get("checkpoint") or {}
@@ -189,15 +192,17 @@ def _planner_runner(
 
 
 def _tool_runner(goal: str) -> Callable[[EvalContext], ScenarioOutcome]:
+    payload = {
+        "user_id": "judge-tools",
+        "session_id": "eval-tools",
+        "text": goal,
+        "intent": {"intent": "planner", "confidence": 0.91},
+    }
+
     def _run(ctx: EvalContext) -> ScenarioOutcome:
         envelope = {
             "meta": {"from": "eval", "to": "planner", "trace_id": f"tool-{time.time_ns()}"},
-            "payload": {
-                "user_id": "judge-tools",
-                "session_id": "eval-tools",
-                "text": goal,
-                "intent": {"intent": "planner", "confidence": 0.91},
-            },
+            "payload": payload,
         }
         result = ctx.planner.handle(envelope)
         plan = result.get("plan") or result.get("checkpoint") or {}
@@ -0,0 +1,103 @@
+"""Framework-independent request handling shared by the HTTP servers.
+
+`server_flask.py` and `server_simple.py` only parse requests and map
+errors to their framework; the chat flow (direct-mode dispatch or router
+fallback, trace IDs, metrics) and the per-user list reads live here so
+both servers behave identically.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from smart_buddy.trace_ids import new_trace_id
+
+
+class UnknownModeError(ValueError):
+    """Raised when a direct-mode request names an agent that does not exist."""
+
+
+def next_trace_id() -> str:
+    # random UUID4, so IDs from separate worker processes cannot collide
+    return f"api_{new_trace_id()}"
+
+
+def chat_impl(
+    *,
+    user_id: str,
+    session_id: str,
+    message: str,
+    mode: Optional[str],
+    mode_agents: Mapping[str, Any],
+    router_agent: Any,
+    metrics: Any,
+    start_time: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Run one chat turn and record its metrics.
+
+    Dispatches straight to `mode_agents[mode]` when `mode` is given,
+    otherwise lets the router classify the message. `start_time` is a
+    `time.perf_counter()` value taken when the request arrived, so latency
+    includes request parsing. Raises `UnknownModeError` for unknown modes;
+    any other failure is recorded as an error metric and re-raised.
+    """
+    if start_time is None:
+        start_time = time.perf_counter()
+
+    if mode:
+        agent = mode_agents.get(mode)
+        if agent is None:
+            raise UnknownModeError(f"Unknown mode: {mode}")
+
+    try:
+        if mode:
+            trace_id = next_trace_id()
+            envelope = {
+                "meta": {"from": "api", "to": mode, "trace_id": trace_id},
+                "payload": {"user_id": user_id, "session_id": session_id, "text": message},
+            }
+            result = agent.handle(envelope)
+            reply = result.get("reply", "No reply")
+            intent = mode
+        else:
+            routed = router_agent.route(user_id, session_id, message)
+            envelope = routed.get("envelope", {})
+            result = routed.get("result", {})
+            reply = result.get("reply", "No reply")
+            mode = envelope.get("meta", {}).get("to", "general")
+            intent = envelope.get("payload", {}).get("intent", {}).get("intent", "unknown")
+            trace_id = envelope.get("meta", {}).get("trace_id", "unknown")
+    except Exception as e:
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        metrics.record_request(
+            mode=mode or "unknown", intent="error", latency_ms=latency_ms, error=type(e).__name__
+        )
+        raise
+
+    latency_ms = (time.perf_counter() - start_time) * 1000
+    metrics.record_request(mode=mode, intent=intent, latency_ms=latency_ms)
+    return {
+        "reply": reply,
+        "trace_id": trace_id,
+        "mode": mode,
+        "latency_ms": round(latency_ms, 2),
+    }
+
+
+def read_user_list(memory: Any, namespace: str, user_id: str) -> list:
+    """Stored list for `user_id` in `namespace` (tasks, events), or []."""
+    return memory.list_all(namespace, user_id)
+
+
+def read_user_dict(memory: Any, namespace: str, user_id: str) -> dict:
+    """Stored mapping for `user_id` in `namespace` (mentor content), or {}."""
+    return memory.get(namespace, user_id, {}) or {}
+
+
+__all__ = [
+    "UnknownModeError",
+    "chat_impl",
+    "next_trace_id",
+    "read_user_dict",
+    "read_user_list",
+]
@@ -7,10 +7,13 @@ Features:
 - Simple retry with exponential backoff for transient errors.
 """
 
+import asyncio
 import os
 import time
 import random
-from typing import Any, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from .logging import get_logger
 from dotenv import load_dotenv
 
@@ -20,11 +23,18 @@ load_dotenv()
 import requests
 from requests import RequestException
 import subprocess
-import shlex
 from pathlib import Path
 import google.generativeai as genai  # type: ignore
 from . import safety
 
+# Runs generate_batch items for every ChatBatcher mode at once (general,
+# mentor and bestfriend, MAX_BATCH_SIZE each) with room for overlapping batches
+_BATCH_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="llm-batch")
+
+# Shared instances handed out by LLM.get_default(), keyed by (api key, model)
+_DEFAULTS: Dict[Tuple[Optional[str], str], "LLM"] = {}
+_DEFAULTS_LOCK = threading.Lock()
+
 
 class LLM:
     def __init__(self):
@@ -38,6 +48,33 @@ class LLM:
             genai.configure(api_key=self.api_key)  # type: ignore
         except Exception:
             pass
+        # SDK model handle, built on first use and reused for every later call
+        self._genai_model: Any = None
+        # generate_async calls in flight, keyed by (event loop id, prompt)
+        self._inflight: Dict[Tuple[int, str], "asyncio.Future[Dict[str, Any]]"] = {}
+
+    @classmethod
+    def get_default(cls) -> "LLM":
+        """Process-wide LLM shared by the agents.
+
+        Agents are built per server, router and request path; sharing one
+        instance configures the SDK once and reuses its model handle and
+        in-flight request map. Keyed by the current GOOGLE_API_KEY and
+        SMART_BUDDY_MODEL so changing either yields a fresh instance.
+        """
+        key = (os.getenv("GOOGLE_API_KEY"), os.getenv("SMART_BUDDY_MODEL", "gemini-2.5-flash"))
+        llm = _DEFAULTS.get(key)
+        if llm is None:
+            with _DEFAULTS_LOCK:
+                llm = _DEFAULTS.get(key)
+                if llm is None:
+                    llm = _DEFAULTS[key] = cls()
+        return llm
+
+    def _get_genai_model(self) -> Any:
+        if self._genai_model is None:
+            self._genai_model = genai.GenerativeModel(self.model)  # type: ignore
+        return self._genai_model
 
     def _get_adc_token(self) -> Optional[str]:
         """Try to obtain an access token via ADC.
@@ -213,6 +250,105 @@ class LLM:
         # Fallback return to satisfy type checker
         return {"error": "unknown"}
 
+    def generate_stream(
+        self, prompt: str, trace_id: Optional[str] = None
+    ) -> Iterator[str]:
+        """Yield reply text incrementally as the Gemini SDK produces it.
+
+        Runs the same local moderation as `generate`. If the streaming SDK call
+        fails before the first chunk arrives, falls back to `generate` and yields
+        its full content once, so callers always go through the fallback chain.
+        Yields nothing when the prompt is blocked by safety.
+        """
+        try:
+            mod = safety.moderate_text(prompt, trace_id=trace_id)
+            if not mod.get("allowed", True):
+                self._logger.info("generation_blocked_by_safety", extra={"reason": mod})
+                return
+        except Exception:
+            self._logger.exception("moderation_failed")
+
+        emitted = False
+        try:
+            model = self._get_genai_model()
+            self._logger.info(
+                "using_google_genai_sdk_stream",
+                extra={"trace_id": trace_id, "model_handle": id(model)},
+            )
+            response = model.generate_content(prompt, stream=True)  # type: ignore
+            for chunk in response:
+                text = getattr(chunk, "text", "")
+                if text:
+                    emitted = True
+                    yield text
+            if emitted:
+                return
+        except Exception as e:
+            self._logger.warning(
+                "google_genai_sdk_stream_failed",
+                extra={"error": str(e), "trace_id": trace_id, "partial": emitted},
+            )
+            if emitted:
+                # Part of the reply already reached the caller; don't repeat it
+                return
+
+        result = self.generate(prompt, trace_id=trace_id)
+        if result and result.get("candidates"):
+            content = result["candidates"][0].get("content", "")
+            if content:
+                yield content
+
+    async def generate_async(
+        self, prompt: str, trace_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Awaitable `generate` that runs the blocking call in a worker thread.
+
+        Concurrent calls with the same prompt on the same event loop share a
+        single generation, so a burst of identical requests costs one API
+        round-trip. Prompts that differ are overlapped one level up, by
+        `ChatBatcher` and `generate_batch`.
+        """
+        loop = asyncio.get_running_loop()
+        key = (id(loop), prompt)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(asyncio.to_thread(self.generate, prompt, trace_id))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _f: self._inflight.pop(key, None))
+        else:
+            self._logger.debug("generate_async_coalesced", extra={"trace_id": trace_id})
+        # shield so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(future)
+
+    def generate_batch(
+        self, prompts: List[str], trace_id: Optional[str] = None
+    ) -> List[str]:
+        """Answer several independent prompts concurrently, one call per prompt.
+
+        Each prompt is sent on its own (never merged with another user's text
+        or history), so the batch only overlaps the round-trips. Results keep
+        the order of `prompts`.
+        """
+        if not prompts:
+            return []
+        if len(prompts) == 1:
+            return [self._content(self.generate(prompts[0], trace_id=trace_id))]
+        self._logger.info(
+            "generate_batch", extra={"items": len(prompts), "trace_id": trace_id}
+        )
+        return list(
+            _BATCH_POOL.map(
+                lambda prompt: self._content(self.generate(prompt, trace_id=trace_id)),
+                prompts,
+            )
+        )
+
+    @staticmethod
+    def _content(result: Optional[Dict[str, Any]]) -> str:
+        if result and result.get("candidates"):
+            return (result["candidates"][0].get("content") or "").strip()
+        return ""
+
     def generate(self, prompt: str, trace_id: Optional[str] = None) -> Dict[str, Any]:
         # Run local moderation before any generation attempt
         try:
@@ -232,8 +368,11 @@ class LLM:
 
         # Use the new google.generativeai SDK
         try:
-            self._logger.info("using_google_genai_sdk", extra={"trace_id": trace_id})
-            model = genai.GenerativeModel(self.model)  # type: ignore
+            model = self._get_genai_model()
+            self._logger.info(
+                "using_google_genai_sdk",
+                extra={"trace_id": trace_id, "model_handle": id(model)},
+            )
             response = model.generate_content(prompt)  # type: ignore
             return {"candidates": [{"content": response.text}]}  # type: ignore
         except Exception as e:
@@ -355,13 +494,19 @@ class LLM:
         gpt4_dir = repo_root / "models" / "gpt4all"
         binary = gpt4_dir / "gpt4all.exe"
         model_file = None
-        if gpt4_dir.exists():
-            for p in gpt4_dir.iterdir():
-                if p.is_file() and (
-                    p.name.startswith("ggml") or p.suffix in [".bin", ".bin.gz"]
-                ):
-                    model_file = p
-                    break
+        try:
+            with os.scandir(gpt4_dir) as entries:
+                model_file = next(
+                    (
+                        Path(entry.path)
+                        for entry in entries
+                        if entry.is_file()
+                        and (entry.name.startswith("ggml") or entry.name.endswith((".bin", ".bin.gz")))
+                    ),
+                    None,
+                )
+        except OSError:
+            pass
 
         if binary.exists() and model_file:
             try:
@@ -369,9 +514,17 @@ class LLM:
                     "using_gpt4all_local_binary",
                     extra={"binary": str(binary), "model": str(model_file)},
                 )
-                cmd = f'"{binary}" --model "{model_file}" --prompt "{prompt}" --n_predict 256'
+                argv = [
+                    str(binary),
+                    "--model",
+                    str(model_file),
+                    "--prompt",
+                    prompt,
+                    "--n_predict",
+                    "256",
+                ]
                 proc = subprocess.Popen(
-                    shlex.split(cmd),
+                    argv,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                     text=True,
@@ -2,16 +2,43 @@
 
 Provides a tiny key/value store with JSON values and a small API
 suitable for session memory, task persistence, and planner checkpoints.
+Growing per-user lists (tasks, events) live in an append-only ``entries``
+table, one row per item, via `append` / `list_all`.
 """
 
+import atexit
 import json
+import queue
 import sqlite3
 import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from .logging import get_logger
 from .audit import audit_trail
 
+try:  # optional: orjson encodes/decodes values several times faster
+    import orjson
+except ImportError:  # pragma: no cover - stdlib json is the fallback
+    orjson = None
+
+# Datetimes and dataclasses go through `default=str` as with stdlib json, so
+# stored values are identical whichever encoder wrote them.
+_ORJSON_OPTIONS = (
+    (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+    if orjson is not None
+    else 0
+)
+
+# Applied once per connection. WAL lets readers run alongside the single
+# writer, and synchronous=NORMAL skips the fsync on every commit (WAL
+# still fsyncs at checkpoints, so the DB cannot corrupt on power loss).
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+)
+
 
 class MemoryBank:
     def __init__(self, db_path: Optional[str] = None):
@@ -19,6 +46,8 @@ class MemoryBank:
         self.db_path = db_path or "smart_buddy_memory.db"
         self._lock = threading.RLock()
         self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in _PRAGMAS:
+            self._conn.execute(pragma)
         self._conn.execute(
             """
             CREATE TABLE IF NOT EXISTS kv (
@@ -30,10 +59,41 @@ class MemoryBank:
             )
             """
         )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS counters (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value INTEGER NOT NULL,
+                PRIMARY KEY(namespace, key)
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT,
+                created_at REAL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_by_key ON entries (namespace, key, id)"
+        )
         self._conn.commit()
         self._logger = get_logger(__name__)
 
     def close(self):
+        """Close the connection after committing writes still in the shared write queue.
+
+        Writes submitted for this bank after `close` fail and are logged.
+        """
+        # outside self._lock: the writer thread needs it to commit
+        if _SHARED_WRITES is not None:
+            _SHARED_WRITES.flush()
         with self._lock:
             try:
                 self._conn.close()
@@ -42,11 +102,21 @@ class MemoryBank:
                 self._logger.exception("db_close_failed")
 
     def _serialize(self, value: Any) -> str:
+        if orjson is not None:
+            try:
+                return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS).decode("utf-8")
+            except TypeError:  # e.g. ints beyond 64 bits; json handles them
+                pass
         return json.dumps(value, default=str, ensure_ascii=False)
 
     def _deserialize(self, raw: Optional[str]) -> Any:
         if raw is None:
             return None
+        if orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except ValueError:  # NaN/Infinity or non-JSON text; let json decide
+                pass
         try:
             return json.loads(raw)
         except Exception:
@@ -55,23 +125,37 @@ class MemoryBank:
     def set(
         self, namespace: str, key: str, value: Any, trace_id: Optional[str] = None
     ) -> None:
-        raw = self._serialize(value)
+        self.set_many([(namespace, key, value)], trace_id=trace_id)
+
+    def set_many(
+        self, items: Iterable[Tuple[Any, ...]], trace_id: Optional[str] = None
+    ) -> None:
+        """Write several ``(namespace, key, value)`` entries in one transaction.
+
+        An item may carry a fourth element, its own trace ID, which then
+        takes precedence over `trace_id` for that item's log and audit entry.
+        """
+        items = [item if len(item) == 4 else (*item, trace_id) for item in items]
+        if not items:
+            return
         now = time.time()
+        rows = [(ns, key, self._serialize(value), now) for ns, key, value, _ in items]
         with self._lock:
-            self._conn.execute(
-                "REPLACE INTO kv (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
-                (namespace, key, raw, now),
+            with self._conn:  # commits once, or rolls back every row on error
+                self._conn.executemany(
+                    "REPLACE INTO kv (namespace, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+        for (namespace, key, value, item_trace_id), (_, _, raw, _) in zip(items, rows):
+            extra = {"namespace": namespace, "key": key, "value_preview": str(raw)[:200]}
+            if item_trace_id:
+                extra["trace_id"] = item_trace_id
+            self._logger.debug("kv_set", extra=extra)
+            audit_trail.record(
+                "memory_write",
+                trace_id=item_trace_id,
+                payload={"namespace": namespace, "key": key, "value_preview": str(value)[:120]},
             )
-            self._conn.commit()
-        extra = {"namespace": namespace, "key": key, "value_preview": str(raw)[:200]}
-        if trace_id:
-            extra["trace_id"] = trace_id
-        self._logger.debug("kv_set", extra=extra)
-        audit_trail.record(
-            "memory_write",
-            trace_id=trace_id,
-            payload={"namespace": namespace, "key": key, "value_preview": str(value)[:120]},
-        )
 
     def get(
         self,
@@ -80,10 +164,11 @@ class MemoryBank:
         default: Any = None,
         trace_id: Optional[str] = None,
     ) -> Any:
-        cur = self._conn.execute(
-            "SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
-        )
-        row = cur.fetchone()
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            row = cur.fetchone()
         if not row:
             return default
         val = self._deserialize(row[0])
@@ -98,8 +183,12 @@ class MemoryBank:
             cur = self._conn.execute(
                 "DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
             )
-            self._conn.commit()
             deleted = cur.rowcount > 0
+            cur = self._conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+            )
+            self._conn.commit()
+            deleted = deleted or cur.rowcount > 0
             extra = {"namespace": namespace, "key": key, "deleted": deleted}
             if trace_id:
                 extra["trace_id"] = trace_id
@@ -111,15 +200,122 @@ class MemoryBank:
         )
         return deleted
 
+    def incr(
+        self, namespace: str, key: str, start: int = 0, trace_id: Optional[str] = None
+    ) -> int:
+        """Atomically increment a counter and return its new value.
+
+        A missing counter is created as ``start + 1``, which lets callers
+        seed it from data written before the counter existed.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO counters (namespace, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT(namespace, key) DO UPDATE SET value = value + 1",
+                    (namespace, key, start + 1),
+                )
+                value = self._conn.execute(
+                    "SELECT value FROM counters WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                ).fetchone()[0]
+        extra = {"namespace": namespace, "key": key, "value": value}
+        if trace_id:
+            extra["trace_id"] = trace_id
+        self._logger.debug("counter_incr", extra=extra)
+        return value
+
+    def append(
+        self, namespace: str, key: str, entry: Any, trace_id: Optional[str] = None
+    ) -> int:
+        """Append `entry` to the list at (namespace, key) and return the new length.
+
+        Existing rows are never rewritten or decoded, so the cost does not
+        grow with the list. A list previously stored with `set` is moved into
+        the entries table by the first append, in the same transaction.
+        """
+        raw = self._serialize(entry)
+        now = time.time()
+        with self._lock:
+            with self._conn:
+                has_entries = self._conn.execute(
+                    "SELECT 1 FROM entries WHERE namespace = ? AND key = ? LIMIT 1",
+                    (namespace, key),
+                ).fetchone()
+                if not has_entries:
+                    self._migrate_list(namespace, key, now)
+                self._conn.execute(
+                    "INSERT INTO entries (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, raw, now),
+                )
+                count = self._conn.execute(
+                    "SELECT COUNT(*) FROM entries WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                ).fetchone()[0]
+        extra = {"namespace": namespace, "key": key, "item_preview": raw[:200]}
+        if trace_id:
+            extra["trace_id"] = trace_id
+        self._logger.debug("entry_append", extra=extra)
+        audit_trail.record(
+            "memory_write",
+            trace_id=trace_id,
+            payload={"namespace": namespace, "key": key, "value_preview": str(entry)[:120]},
+        )
+        return count
+
+    def list_all(
+        self, namespace: str, key: str, trace_id: Optional[str] = None
+    ) -> List[Any]:
+        """Entries appended to (namespace, key), oldest first.
+
+        Falls back to a value stored with `set` when nothing has been
+        appended yet (a non-list value is wrapped in a list, as
+        `append_to_list` always did); returns [] when neither exists.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ? ORDER BY id",
+                (namespace, key),
+            ).fetchall()
+        if not rows:
+            legacy = self.get(namespace, key, [], trace_id=trace_id) or []
+            return legacy if isinstance(legacy, list) else [legacy]
+        extra = {"namespace": namespace, "key": key, "count": len(rows)}
+        if trace_id:
+            extra["trace_id"] = trace_id
+        self._logger.debug("entries_list", extra=extra)
+        return [self._deserialize(r[0]) for r in rows]
+
+    def _migrate_list(self, namespace: str, key: str, now: float) -> None:
+        # caller holds the lock and an open transaction
+        row = self._conn.execute(
+            "SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if not row:
+            return
+        legacy = self._deserialize(row[0]) or []
+        if not isinstance(legacy, list):
+            legacy = [legacy]
+        if legacy:
+            self._conn.executemany(
+                "INSERT INTO entries (namespace, key, value, created_at) VALUES (?, ?, ?, ?)",
+                [(namespace, key, self._serialize(item), now) for item in legacy],
+            )
+        self._conn.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+
     def keys(self, namespace: str) -> List[str]:
-        cur = self._conn.execute("SELECT key FROM kv WHERE namespace = ?", (namespace,))
-        return [r[0] for r in cur.fetchall()]
+        with self._lock:
+            cur = self._conn.execute("SELECT key FROM kv WHERE namespace = ?", (namespace,))
+            rows = cur.fetchall()
+        return [r[0] for r in rows]
 
     def get_namespace(self, namespace: str) -> Dict[str, Any]:
-        cur = self._conn.execute(
-            "SELECT key, value FROM kv WHERE namespace = ?", (namespace,)
-        )
-        return {r[0]: self._deserialize(r[1]) for r in cur.fetchall()}
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT key, value FROM kv WHERE namespace = ?", (namespace,)
+            )
+            rows = cur.fetchall()
+        return {r[0]: self._deserialize(r[1]) for r in rows}
 
     def append_to_list(
         self, namespace: str, key: str, item: Any, trace_id: Optional[str] = None
@@ -133,3 +329,105 @@ class MemoryBank:
         if trace_id:
             extra["trace_id"] = trace_id
         self._logger.debug("kv_append", extra=extra)
+
+
+class MemoryWriteQueue:
+    """Write-behind buffer for MemoryBank writes nobody reads back right away.
+
+    `submit` enqueues and returns at once; one daemon thread, started on the
+    first submit, drains up to `batch_size` pending writes and commits them
+    with one `set_many` per bank, in submission order. A full queue blocks
+    the caller for up to `put_timeout` seconds; a write that still does not
+    fit is logged and dropped rather than overtaking older queued writes.
+    Use `shared_write_queue()` rather than one instance per agent; `close`
+    stops a private instance's thread. Pending writes are flushed at exit,
+    and `MemoryBank.close` flushes the shared queue first.
+    """
+
+    _STOP = object()
+
+    def __init__(self, maxsize: int = 1024, batch_size: int = 64, put_timeout: float = 5.0) -> None:
+        self.batch_size = batch_size
+        self.put_timeout = put_timeout
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._logger = get_logger(__name__)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def submit(
+        self,
+        memory: MemoryBank,
+        namespace: str,
+        key: str,
+        value: Any,
+        trace_id: Optional[str] = None,
+    ) -> None:
+        thread = self._thread
+        if thread is None or not thread.is_alive():  # first use, or a forked child
+            self._start()
+        try:
+            self._queue.put((memory, namespace, key, value, trace_id), timeout=self.put_timeout)
+        except queue.Full:
+            self._logger.warning(
+                "memory_write_queue_full",
+                extra={"namespace": namespace, "key": key, "trace_id": trace_id},
+            )
+
+    def flush(self) -> None:
+        """Block until every submitted write has been committed."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Commit pending writes and stop the writer thread."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(self._STOP)
+            thread.join()
+        self._thread = None
+        atexit.unregister(self.flush)
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size and batch[-1] is not self._STOP:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is self._STOP
+            writes = batch[:-1] if stop else batch
+            # one transaction per bank; dicts keep first-seen order
+            by_bank: Dict[int, Tuple[MemoryBank, List[Tuple[str, str, Any, Optional[str]]]]] = {}
+            for memory, namespace, key, value, trace_id in writes:
+                by_bank.setdefault(id(memory), (memory, []))[1].append((namespace, key, value, trace_id))
+            for memory, items in by_bank.values():
+                try:
+                    memory.set_many(items)
+                except Exception:
+                    self._logger.exception("memory_write_queue_failed", extra={"count": len(items)})
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+
+_SHARED_WRITES: Optional[MemoryWriteQueue] = None
+_SHARED_WRITES_LOCK = threading.Lock()
+
+
+def shared_write_queue() -> MemoryWriteQueue:
+    """The process-wide MemoryWriteQueue, created on first use."""
+    global _SHARED_WRITES
+    if _SHARED_WRITES is None:
+        with _SHARED_WRITES_LOCK:
+            if _SHARED_WRITES is None:
+                _SHARED_WRITES = MemoryWriteQueue()
+    return _SHARED_WRITES
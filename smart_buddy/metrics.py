@@ -11,6 +11,34 @@ from datetime import datetime
 from pathlib import Path
 import threading
 
+# Static dashboard chrome, built once at import; only the body is rendered per request
+_DASHBOARD_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Smart Buddy Metrics</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
+        .container { max-width: 1200px; margin: 0 auto; }
+        .card { background: white; padding: 20px; margin: 10px 0; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        h1 { color: #333; }
+        h2 { color: #666; margin-top: 0; }
+        .metric { display: inline-block; margin: 10px 20px 10px 0; }
+        .metric-label { color: #888; font-size: 14px; }
+        .metric-value { color: #333; font-size: 24px; font-weight: bold; }
+        .good { color: #28a745; }
+        .warning { color: #ffc107; }
+        .bad { color: #dc3545; }
+        table { width: 100%; border-collapse: collapse; }
+        th, td { padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }
+        th { background: #f8f9fa; }
+    </style>
+</head>
+<body>
+"""
+_DASHBOARD_TAIL = """</body>
+</html>
+"""
+
 
 class MetricsCollector:
     """Production-grade metrics collection with percentile tracking.
@@ -31,6 +59,8 @@ class MetricsCollector:
         # Latency tracking (milliseconds)
         self.latencies = deque(maxlen=window_size)
         self.latencies_by_mode = defaultdict(lambda: deque(maxlen=window_size))
+        # Time to first token for streamed responses (milliseconds)
+        self.ttft_latencies = deque(maxlen=window_size)
         
         # Token tracking
         self.tokens_used = defaultdict(int)  # {mode: count}
@@ -65,9 +95,14 @@ class MetricsCollector:
         latency_ms: float,
         tokens: int = 0,
         error: Optional[str] = None,
-        sentiment: Optional[str] = None
+        sentiment: Optional[str] = None,
+        ttft_ms: Optional[float] = None
     ):
-        """Record a request with all metadata."""
+        """Record a request with all metadata.
+
+        `latency_ms` is the full response time; streamed responses also pass
+        `ttft_ms`, the time until the first chunk was sent.
+        """
         with self.lock:
             self.request_count += 1
             self.requests_by_mode[mode] += 1
@@ -76,6 +111,8 @@ class MetricsCollector:
             # Latency
             self.latencies.append(latency_ms)
             self.latencies_by_mode[mode].append(latency_ms)
+            if ttft_ms is not None:
+                self.ttft_latencies.append(ttft_ms)
             
             # Tokens
             if tokens > 0:
@@ -97,6 +134,7 @@ class MetricsCollector:
                 'mode': mode,
                 'intent': intent,
                 'latency_ms': latency_ms,
+                'ttft_ms': ttft_ms,
                 'tokens': tokens,
                 'error': error,
                 'sentiment': sentiment
@@ -124,6 +162,7 @@ class MetricsCollector:
                 'total_tokens': self.total_tokens,
                 'tokens_per_request': round(self.total_tokens / self.request_count, 2) if self.request_count > 0 else 0,
                 'latency': self._calculate_percentiles(list(self.latencies)),
+                'ttft': self._calculate_percentiles(list(self.ttft_latencies)),
                 'latency_by_mode': {
                     mode: self._calculate_percentiles(list(latencies))
                     for mode, latencies in self.latencies_by_mode.items()
@@ -148,30 +187,7 @@ class MetricsCollector:
         """Generate simple HTML dashboard for /metrics endpoint."""
         summary = self.get_summary()
         
-        html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Smart Buddy Metrics</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
-        .container {{ max-width: 1200px; margin: 0 auto; }}
-        .card {{ background: white; padding: 20px; margin: 10px 0; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-        h1 {{ color: #333; }}
-        h2 {{ color: #666; margin-top: 0; }}
-        .metric {{ display: inline-block; margin: 10px 20px 10px 0; }}
-        .metric-label {{ color: #888; font-size: 14px; }}
-        .metric-value {{ color: #333; font-size: 24px; font-weight: bold; }}
-        .good {{ color: #28a745; }}
-        .warning {{ color: #ffc107; }}
-        .bad {{ color: #dc3545; }}
-        table {{ width: 100%; border-collapse: collapse; }}
-        th, td {{ padding: 8px; text-align: left; border-bottom: 1px solid #ddd; }}
-        th {{ background: #f8f9fa; }}
-    </style>
-</head>
-<body>
-    <div class="container">
+        body = f"""    <div class="container">
         <h1>🤖 Smart Buddy Metrics Dashboard</h1>
         
         <div class="card">
@@ -212,6 +228,10 @@ class MetricsCollector:
                 <div class="metric-label">p999</div>
                 <div class="metric-value">{summary['latency'].get('p999', 0)}</div>
             </div>
+            <div class="metric">
+                <div class="metric-label">Stream TTFT p50 / p95</div>
+                <div class="metric-value">{summary['ttft'].get('p50', 0)} / {summary['ttft'].get('p95', 0)}</div>
+            </div>
         </div>
         
         <div class="card">
@@ -246,10 +266,8 @@ class MetricsCollector:
             Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         </p>
     </div>
-</body>
-</html>
-        """
-        return html
+"""
+        return "".join((_DASHBOARD_HEAD, body, _DASHBOARD_TAIL))
     
     def _calculate_percentiles(self, values: List[float]) -> Dict[str, float]:
         """Calculate latency percentiles."""
@@ -274,7 +274,7 @@ class RAGKnowledgeBase:
                 "answer": "I do not have relevant knowledge for that yet.",
                 "citations": [],
             }
-        llm = llm or LLM()
+        llm = llm or LLM.get_default()
         prompt = (
             "You are a grounded assistant. Use ONLY the provided context to answer.\n"
             "If the answer is not in the context, say you don't know.\n"
@@ -0,0 +1,113 @@
+"""Two-tier cache for LLM replies, keyed by normalized prompt.
+
+The agents' latency is dominated by the blocking `LLM.generate` call, and
+many prompts repeat verbatim ("show my tasks", stock teaching questions,
+greetings). `ResponseCache` keeps recent replies in an in-process LRU and
+persists them in the MemoryBank under the ``"llm_cache"`` namespace so a
+restart does not start cold.
+
+Keys are the SHA-256 of the prompt after lowercasing and collapsing
+whitespace. Without ``memory`` the cache is in-process only.
+
+Stub replies from the offline fallback and empty replies are never cached,
+so a transient outage cannot pin a placeholder answer.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Optional
+
+from smart_buddy.cache import TTLCache
+from smart_buddy.logging import get_logger
+
+_MISSING = object()
+_STUB_PREFIX = "[stub reply]"
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.lower().split())
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+
+
+def is_cacheable_reply(reply: Optional[str]) -> bool:
+    """True for real model output; False for empty or offline stub replies."""
+    return bool(reply) and not reply.startswith(_STUB_PREFIX)  # type: ignore[union-attr]
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        memory: Any = None,
+        maxsize: int = 512,
+        ttl: float = 24 * 3600,
+        namespace: str = "llm_cache",
+    ) -> None:
+        self.memory = memory
+        self.namespace = namespace
+        self.ttl = ttl
+        self._lru = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._logger = get_logger(__name__)
+
+    def get(self, prompt: str) -> Any:
+        """Cached value for `prompt`, or None."""
+        value = self._lookup(prompt_key(prompt))
+        return None if value is _MISSING else value
+
+    def set(self, prompt: str, value: Any, *, persist: bool = True) -> None:
+        """Cache `value` for `prompt`; `persist=False` keeps it in-process only.
+
+        Expired rows are only skipped on read, never deleted, so prompts that
+        will not repeat (e.g. ones carrying conversation history) should not
+        be persisted.
+        """
+        key = prompt_key(prompt)
+        self._lru.set(key, value)
+        if persist and self.memory is not None:
+            try:
+                self.memory.set(self.namespace, key, {"value": value, "created_at": time.time()})
+            except Exception as e:
+                self._logger.warning("llm_cache_persist_failed", extra={"error": str(e)})
+
+    def generate(self, llm: Any, prompt: str, *, persist: bool = True) -> str:
+        """Stripped reply for `prompt`, calling `llm.generate` only on a miss.
+
+        Returns "" when the model gives no usable content. Exceptions from
+        the LLM propagate so callers keep their own fallback handling.
+        `persist` is passed to `set`.
+        """
+        cached = self.get(prompt)
+        if isinstance(cached, str):
+            return cached
+        result = llm.generate(prompt)
+        reply = ""
+        if result and result.get("candidates"):
+            reply = (result["candidates"][0].get("content") or "").strip()
+        if is_cacheable_reply(reply):
+            self.set(prompt, reply, persist=persist)
+        return reply
+
+    def clear(self) -> None:
+        """Drop the in-process tier; persisted entries are left to expire."""
+        self._lru.clear()
+
+    def _lookup(self, key: str) -> Any:
+        value = self._lru.get(key, _MISSING)
+        if value is not _MISSING or self.memory is None:
+            return value
+        try:
+            stored = self.memory.get(self.namespace, key)
+        except Exception:
+            return _MISSING
+        if not isinstance(stored, dict) or "value" not in stored:
+            return _MISSING
+        if time.time() - stored.get("created_at", 0) > self.ttl:
+            return _MISSING
+        self._lru.set(key, stored["value"])
+        return stored["value"]
+
+
+__all__ = ["ResponseCache", "is_cacheable_reply", "normalize_prompt", "prompt_key"]
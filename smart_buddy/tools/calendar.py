@@ -35,9 +35,7 @@ class CalendarTool(Tool):
 
     # ------------------------------------------------------------------
     def _list_upcoming(self, request: ToolRequest) -> ToolResult:
-        events: List[Dict[str, Any]] = (
-            self.memory.get(self._namespace, request.user_id, []) or []
-        )
+        events: List[Dict[str, Any]] = self.memory.list_all(self._namespace, request.user_id)
         upcoming = events[-3:][::-1]
         return ToolResult(
             name=self.name,
@@ -66,14 +64,10 @@ class CalendarTool(Tool):
             "time": request.arguments.get("time", "09:00"),
             "source": "tool_bus",
         }
-        events: List[Dict[str, Any]] = (
-            self.memory.get(self._namespace, request.user_id, []) or []
-        )
-        events.append(event)
-        self.memory.set(self._namespace, request.user_id, events, trace_id=request.trace_id)
+        total = self.memory.append(self._namespace, request.user_id, event, trace_id=request.trace_id)
         return ToolResult(
             name=self.name,
             success=True,
             output={"created": event},
-            diagnostics={"total_events": len(events)},
+            diagnostics={"total_events": total},
         )
@@ -0,0 +1,43 @@
+"""Random (version 4) UUID strings for trace IDs, without a syscall per ID.
+
+`uuid.uuid4()` reads 16 bytes from ``os.urandom`` on every call. Trace IDs
+only need to be unique, so `new_trace_id` slices them from a per-thread
+4 KiB buffer of the same OS randomness, refilled every 256 IDs. Anything
+needing a fresh uuid4 per value (e.g. plan IDs) should keep using `uuid`.
+"""
+from __future__ import annotations
+
+import os
+import threading
+
+_BUFFER_BYTES = 4096
+_tls = threading.local()
+
+
+def _reset_after_fork() -> None:
+    # a forked worker must not replay the parent's buffered bytes
+    global _tls
+    _tls = threading.local()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def new_trace_id() -> str:
+    """Return a random UUID4 string such as ``"1b4e28ba-2fa1-4d2e-883f-0016d3cca427"``."""
+    tls = _tls
+    buf = getattr(tls, "buf", b"")
+    offset = getattr(tls, "offset", _BUFFER_BYTES)
+    if offset >= len(buf):
+        buf = tls.buf = os.urandom(_BUFFER_BYTES)
+        offset = 0
+    tls.offset = offset + 16
+    raw = bytearray(buf[offset:offset + 16])
+    raw[6] = (raw[6] & 0x0F) | 0x40  # version 4
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+__all__ = ["new_trace_id"]
@@ -0,0 +1,60 @@
+import os
+import threading
+import time
+
+import pytest
+
+from smart_buddy.audit import AuditTrail
+
+
+def test_audit_records_from_many_threads_get_unique_ordered_ids():
+    trail = AuditTrail(max_events=1000)
+
+    def worker(n):
+        for i in range(100):
+            trail.record("memory_write", trace_id=f"t{n}", payload={"i": i})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    events = trail.list_events()
+    assert len(events) == 400
+    assert [e["id"] for e in events] == list(range(400, 0, -1))
+
+
+def test_audit_override_sees_just_recorded_event():
+    trail = AuditTrail()
+    event = trail.record("moderation_block", severity="warning")
+    assert event["id"] == 1
+    assert trail.override(1, "false positive")
+    assert trail.list_events(limit=1)[0]["status"] == "overridden"
+
+
+def test_audit_list_events_limit_and_unknown_override():
+    trail = AuditTrail()
+    for i in range(5):
+        trail.record("tool_call", payload={"i": i})
+    assert [e["id"] for e in trail.list_events(limit=2)] == [5, 4]
+    assert not trail.override(99, "missing")
+    assert not trail.override(0, "missing")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_audit_forked_child_gets_a_working_flusher():
+    trail = AuditTrail()
+    trail.record("tool_call")
+    trail.flush()
+    pid = os.fork()
+    if pid == 0:  # child: the inherited flusher thread is gone
+        ok = False
+        try:
+            event = trail.record("tool_call")
+            start = time.monotonic()
+            events = trail.list_events()
+            ok = events[0] is event and time.monotonic() - start < 1.0
+        finally:
+            os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+from smart_buddy.batching import ChatBatcher
+
+
+def test_batcher_coalesces_concurrent_submissions():
+    calls = []
+
+    def handle_batch(envelopes):
+        calls.append(len(envelopes))
+        return [{"reply": env["payload"]["text"].upper()} for env in envelopes]
+
+    async def run():
+        batcher = ChatBatcher(handle_batch, max_batch_size=8, max_wait=0.05)
+        envelopes = [{"payload": {"text": f"msg{i}"}} for i in range(5)]
+        results = await asyncio.gather(*(batcher.submit(env) for env in envelopes))
+        await batcher.close()
+        return results
+
+    results = asyncio.run(run())
+    assert [r["reply"] for r in results] == [f"MSG{i}" for i in range(5)]
+    assert calls == [5]
+
+
+def test_batcher_respects_max_batch_size_and_propagates_errors():
+    calls = []
+
+    def handle_batch(envelopes):
+        calls.append(len(envelopes))
+        if any(env["payload"]["text"] == "boom" for env in envelopes):
+            raise ValueError("agent failure")
+        return [{"reply": "ok"} for _ in envelopes]
+
+    async def run():
+        batcher = ChatBatcher(handle_batch, max_batch_size=2, max_wait=0.05)
+        ok = await asyncio.gather(*(batcher.submit({"payload": {"text": "hi"}}) for _ in range(3)))
+        try:
+            await batcher.submit({"payload": {"text": "boom"}})
+        except ValueError as exc:
+            error = str(exc)
+        else:
+            error = None
+        await batcher.close()
+        return ok, error
+
+    ok, error = asyncio.run(run())
+    assert [r["reply"] for r in ok] == ["ok", "ok", "ok"]
+    assert calls[:2] == [2, 1]
+    assert error == "agent failure"
+
+
+def test_batcher_runs_batches_concurrently():
+    # each batch waits for the other; a serial dispatcher breaks the barrier
+    barrier = threading.Barrier(2, timeout=2)
+
+    def handle_batch(envelopes):
+        barrier.wait()
+        return [{"reply": "ok"} for _ in envelopes]
+
+    async def run():
+        batcher = ChatBatcher(handle_batch, max_batch_size=1, max_wait=0.01)
+        results = await asyncio.gather(*(batcher.submit({"payload": {"text": "hi"}}) for _ in range(2)))
+        await batcher.close()
+        return results
+
+    assert [r["reply"] for r in asyncio.run(run())] == ["ok", "ok"]
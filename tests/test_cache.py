@@ -0,0 +1,31 @@
+import time
+
+from smart_buddy.cache import TTLCache
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=4, ttl=0.05)
+    cache.set(("tasks", "u1"), [1])
+    assert cache.get(("tasks", "u1")) == [1]
+    time.sleep(0.06)
+    assert cache.get(("tasks", "u1")) is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.pop("c") == 3
+    assert len(cache) == 1
+
+
+def test_ttl_cache_get_or_set_calls_factory_once():
+    cache = TTLCache(ttl=60)
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_set("k", lambda: calls.append(1) or []) == []
+    assert len(calls) == 1
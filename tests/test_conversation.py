@@ -0,0 +1,89 @@
+import os
+import tempfile
+import threading
+import time
+
+from smart_buddy.conversation import ConversationContext
+from smart_buddy.memory import MemoryBank
+
+
+class _SummaryLLM:
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, prompt):
+        self.prompts.append(prompt)
+        return {"candidates": [{"content": "user is learning python"}]}
+
+
+def test_render_includes_recent_turns():
+    with tempfile.TemporaryDirectory() as td:
+        mem = MemoryBank(os.path.join(td, "mem.db"))
+        convo = ConversationContext(mem, _SummaryLLM())
+        key = ConversationContext.key("u1", None)
+        assert convo.render(key) == ""
+        convo.record(key, "hi", "hello!")
+        assert "User: hi\nAssistant: hello!" in convo.render(key)
+        mem.close()
+
+
+def test_long_history_is_folded_into_summary():
+    with tempfile.TemporaryDirectory() as td:
+        mem = MemoryBank(os.path.join(td, "mem.db"))
+        llm = _SummaryLLM()
+        convo = ConversationContext(mem, llm, max_pending_tokens=50)
+        key = ConversationContext.key("u1", "s1")
+        for i in range(3):
+            convo.record(key, f"question {i} " * 10, "answer " * 10)
+        deadline = time.time() + 5
+        while "Summary of earlier" not in convo.render(key) and time.time() < deadline:
+            time.sleep(0.01)
+        context = convo.render(key)
+        assert "user is learning python" in context
+        assert len(context) < 1000
+        assert len(llm.prompts) >= 1
+        mem.close()
+
+
+class _SlowMemory:
+    """Dict-backed bank whose reads yield, so racing read-modify-writes interleave."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, namespace, key):
+        value = self.data.get((namespace, key))
+        time.sleep(0.001)
+        return value
+
+    def set(self, namespace, key, value):
+        self.data[(namespace, key)] = value
+
+
+def test_separate_contexts_on_one_key_keep_every_turn():
+    mem = _SlowMemory()
+    first = ConversationContext(mem, _SummaryLLM(), max_pending_tokens=10**6)
+    second = ConversationContext(mem, _SummaryLLM(), max_pending_tokens=10**6)
+    key = ConversationContext.key("u1", "s1")
+
+    def record(convo, tag):
+        for i in range(20):
+            convo.record(key, f"{tag}{i}", "ok")
+
+    threads = [threading.Thread(target=record, args=(c, t)) for c, t in ((first, "a"), (second, "b"))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(mem.get("convo_summary", key)["pending"]) == 40
+
+
+def test_prompts_without_context_match_the_context_free_layout():
+    from smart_buddy.agents import general_agent, mentor
+
+    assert general_agent._GENERAL_PROMPT({"text": "hi", "context": ""}).startswith(
+        "You are Smart Buddy, a helpful AI assistant like ChatGPT.\n\nUser: hi\n\n"
+    )
+    assert mentor._GENERAL_PROMPT({"text": "hi", "context": ""}).startswith(
+        'You are a supportive mentor. Student said: "hi"\n\n'
+    )
@@ -0,0 +1,33 @@
+import os
+import tempfile
+
+from smart_buddy.agents.general_agent import GeneralAgent, _marker_object
+from smart_buddy.llm import LLM
+from smart_buddy.memory import MemoryBank
+
+
+def test_marker_object_waits_for_balanced_json():
+    marker = "EVENT_CREATED:"
+    assert _marker_object('EVENT_CREATED: {"title": "a}', marker) is None
+    assert _marker_object('EVENT_CREATED: {"title": "a}"} trailing', marker) == '{"title": "a}"}'
+    assert _marker_object("no marker here", marker) is None
+
+
+def test_task_creation_stops_streaming_after_marker(monkeypatch):
+    pulled = []
+
+    def fake_stream(self, prompt, trace_id=None):
+        for chunk in ('TASK_CREATED: {"text": "buy milk"', "}", " and a long tail", " nobody reads"):
+            pulled.append(chunk)
+            yield chunk
+
+    monkeypatch.setattr(LLM, "generate_stream", fake_stream)
+    with tempfile.TemporaryDirectory() as td:
+        mem = MemoryBank(os.path.join(td, "mem.db"))
+        agent = GeneralAgent(memory=mem)
+        result = agent.handle({"meta": {}, "payload": {"user_id": "u1", "text": "add task buy milk"}})
+        assert result["action"] == "task_created"
+        assert mem.list_all("tasks", "u1") == [{"text": "buy milk", "id": 1}]
+        assert len(pulled) == 2
+        assert mem.keys("llm_cache") == []
+        mem.close()
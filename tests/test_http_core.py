@@ -0,0 +1,65 @@
+import pytest
+
+from smart_buddy.http_core import UnknownModeError, chat_impl
+
+
+class _EchoAgent:
+    def __init__(self):
+        self.envelopes = []
+
+    def handle(self, envelope):
+        self.envelopes.append(envelope)
+        return {"reply": envelope["payload"]["text"].upper()}
+
+
+class _Router:
+    def route(self, user_id, session_id, text):
+        return {
+            "envelope": {
+                "meta": {"to": "mentor", "trace_id": "t-1"},
+                "payload": {"intent": {"intent": "learning"}},
+            },
+            "result": {"reply": "routed"},
+        }
+
+
+class _Metrics:
+    def __init__(self):
+        self.calls = []
+
+    def record_request(self, **kwargs):
+        self.calls.append(kwargs)
+
+
+def test_chat_impl_direct_mode_uses_unique_trace_ids():
+    agent, metrics = _EchoAgent(), _Metrics()
+    kwargs = dict(
+        user_id="u", session_id="s", message="hi", mode="general",
+        mode_agents={"general": agent}, router_agent=None, metrics=metrics,
+    )
+    first = chat_impl(**kwargs)
+    second = chat_impl(**kwargs)
+    assert first["reply"] == "HI" and first["mode"] == "general"
+    assert first["trace_id"] != second["trace_id"]
+    assert metrics.calls[0]["intent"] == "general"
+
+
+def test_chat_impl_routes_without_mode():
+    metrics = _Metrics()
+    result = chat_impl(
+        user_id="u", session_id="s", message="teach me", mode=None,
+        mode_agents={}, router_agent=_Router(), metrics=metrics,
+    )
+    assert result["reply"] == "routed"
+    assert result["trace_id"] == "t-1"
+    assert metrics.calls[0]["intent"] == "learning"
+
+
+def test_chat_impl_rejects_unknown_mode_without_recording_error():
+    metrics = _Metrics()
+    with pytest.raises(UnknownModeError):
+        chat_impl(
+            user_id="u", session_id="s", message="hi", mode="nope",
+            mode_agents={}, router_agent=None, metrics=metrics,
+        )
+    assert metrics.calls == []
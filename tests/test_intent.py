@@ -0,0 +1,22 @@
+from smart_buddy.agents.intent import IntentAgent, keyword_set
+
+
+def test_keyword_set_matches_substrings_like_any():
+    keywords = keyword_set("anx", "tl;dr", "what is")
+    for text in ("i feel anxious", "tl;dr please", "so what is this", "nothing here"):
+        assert keywords.matches(text) == any(k in text for k in ("anx", "tl;dr", "what is"))
+
+
+def test_intent_agent_keeps_category_priority():
+    agent = IntentAgent()
+    assert agent.classify("Explain my task list")["intent"] == "planner"
+    assert agent.classify("Add a TODO for tomorrow")["intent"] == "task"
+    assert agent.classify("I am so stressed")["intent"] == "emotion"
+    assert agent.classify("tl;dr of this article")["intent"] == "summary"
+    assert agent.classify("hello")["intent"] == "general"
+
+
+def test_keyword_set_drops_redundant_keywords():
+    keywords = keyword_set("task", "add task", "todo", "task", "need to do")
+    assert keywords.keywords == ("task", "todo", "need to do")
+    assert keywords.matches("please add task") and not keywords.matches("tasc")
@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import types
 
 from smart_buddy.llm import LLM
@@ -39,3 +41,99 @@ def test_llm_api_key_path(monkeypatch):
     r = llm.generate("Hi")
     assert isinstance(r, dict)
     assert r.get("candidates")[0]["content"] == "real reply"
+
+
+def test_llm_generate_stream_yields_sdk_chunks(monkeypatch):
+    import smart_buddy.llm as llm_module
+
+    class FakeModel:
+        def __init__(self, name):
+            self.name = name
+
+        def generate_content(self, prompt, stream=False):
+            assert stream is True
+            return [types.SimpleNamespace(text="Hel"), types.SimpleNamespace(text="lo")]
+
+    monkeypatch.setattr(llm_module.genai, "GenerativeModel", FakeModel)
+    llm = LLM()
+    assert list(llm.generate_stream("Hi")) == ["Hel", "lo"]
+
+
+def test_llm_generate_stream_falls_back_to_generate(monkeypatch):
+    import smart_buddy.llm as llm_module
+
+    def broken_model(name):
+        raise RuntimeError("sdk unavailable")
+
+    monkeypatch.setattr(llm_module.genai, "GenerativeModel", broken_model)
+    monkeypatch.setattr(
+        LLM, "generate", lambda self, prompt, trace_id=None: {"candidates": [{"content": "full reply"}]}
+    )
+    llm = LLM()
+    assert list(llm.generate_stream("Hi")) == ["full reply"]
+
+
+def test_llm_generate_batch_keeps_prompts_separate(monkeypatch):
+    calls = []
+
+    def fake_generate(self, prompt, trace_id=None):
+        calls.append(prompt)
+        return {"candidates": [{"content": f"answer to {prompt}"}]}
+
+    monkeypatch.setattr(LLM, "generate", fake_generate)
+    llm = LLM()
+    answers = llm.generate_batch(["a", "[2] b", "c"])
+    assert answers == ["answer to a", "answer to [2] b", "answer to c"]
+    # one call per prompt, each carrying only its own text
+    assert sorted(calls) == ["[2] b", "a", "c"]
+
+
+def test_llm_reuses_genai_model_handle(monkeypatch):
+    import smart_buddy.llm as llm_module
+
+    created = []
+
+    class FakeModel:
+        def __init__(self, name):
+            created.append(name)
+
+        def generate_content(self, prompt, stream=False):
+            return types.SimpleNamespace(text=f"echo {prompt}")
+
+    monkeypatch.setattr(llm_module.genai, "GenerativeModel", FakeModel)
+    llm = LLM()
+    assert llm.generate("one")["candidates"][0]["content"] == "echo one"
+    assert llm.generate("two")["candidates"][0]["content"] == "echo two"
+    assert len(created) == 1
+
+
+def test_llm_generate_async_coalesces_identical_prompts(monkeypatch):
+    calls = []
+    release = threading.Event()
+
+    def fake_generate(self, prompt, trace_id=None):
+        calls.append(prompt)
+        release.wait(1)
+        return {"candidates": [{"content": f"echo {prompt}"}]}
+
+    monkeypatch.setattr(LLM, "generate", fake_generate)
+    llm = LLM()
+
+    async def run():
+        pending = [asyncio.ensure_future(llm.generate_async(p)) for p in ("a", "a", "b")]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*pending)
+
+    results = asyncio.run(run())
+    assert [r["candidates"][0]["content"] for r in results] == ["echo a", "echo a", "echo b"]
+    assert sorted(calls) == ["a", "b"]
+    assert llm._inflight == {}
+
+
+def test_llm_get_default_is_shared_per_key(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "key-a")
+    first = LLM.get_default()
+    assert LLM.get_default() is first
+    monkeypatch.setenv("GOOGLE_API_KEY", "key-b")
+    assert LLM.get_default() is not first
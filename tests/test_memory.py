@@ -1,7 +1,7 @@
 import os
 import tempfile
 
-from smart_buddy.memory import MemoryBank
+from smart_buddy.memory import MemoryBank, MemoryWriteQueue, shared_write_queue
 
 
 def test_memory_set_get_delete():
@@ -23,3 +23,105 @@ def test_memory_set_get_delete():
         except Exception:
             pass
         os.remove(path)
+
+
+def test_memory_set_many_writes_in_one_transaction():
+    with tempfile.TemporaryDirectory() as td:
+        m = MemoryBank(db_path=os.path.join(td, "mem.db"))
+        try:
+            m.set_many([("tasks", "u1", [1]), ("events", "u1", [{"title": "x"}])])
+            assert m.get("tasks", "u1") == [1]
+            assert m.get("events", "u1") == [{"title": "x"}]
+            mode = m._conn.execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode.lower() == "wal"
+        finally:
+            m.close()
+
+
+def test_memory_incr_is_monotonic_and_seedable():
+    with tempfile.TemporaryDirectory() as td:
+        m = MemoryBank(db_path=os.path.join(td, "mem.db"))
+        try:
+            assert m.incr("event_ids", "u1") == 1
+            assert m.incr("event_ids", "u1") == 2
+            assert m.incr("event_ids", "u2", start=5) == 6
+            assert m.incr("event_ids", "u2", start=5) == 7
+        finally:
+            m.close()
+
+
+def test_memory_append_migrates_set_list_and_lists_in_order():
+    with tempfile.TemporaryDirectory() as td:
+        m = MemoryBank(db_path=os.path.join(td, "mem.db"))
+        try:
+            assert m.list_all("tasks", "u1") == []
+            m.set("tasks", "u1", [{"id": 1}])
+            assert m.list_all("tasks", "u1") == [{"id": 1}]
+            assert m.append("tasks", "u1", {"id": 2}) == 2
+            assert m.append("tasks", "u1", {"id": 3}) == 3
+            assert m.list_all("tasks", "u1") == [{"id": 1}, {"id": 2}, {"id": 3}]
+            assert m.get("tasks", "u1") is None
+            assert m.delete("tasks", "u1") and m.list_all("tasks", "u1") == []
+        finally:
+            m.close()
+
+
+def test_memory_append_keeps_non_list_legacy_value():
+    with tempfile.TemporaryDirectory() as td:
+        m = MemoryBank(db_path=os.path.join(td, "mem.db"))
+        try:
+            m.set("notes", "u1", {"text": "old"})
+            assert m.list_all("notes", "u1") == [{"text": "old"}]
+            assert m.append("notes", "u1", {"text": "new"}) == 2
+            assert m.list_all("notes", "u1") == [{"text": "old"}, {"text": "new"}]
+        finally:
+            m.close()
+
+
+def test_memory_write_queue_flushes_batched_writes():
+    with tempfile.TemporaryDirectory() as td:
+        m = MemoryBank(db_path=os.path.join(td, "mem.db"))
+        other = MemoryBank(db_path=os.path.join(td, "other.db"))
+        writes = MemoryWriteQueue(batch_size=8)
+        try:
+            for i in range(20):
+                writes.submit(m, "sessions", f"s{i}", {"n": i}, trace_id=f"t{i}")
+                writes.submit(other, "sessions", "last", {"n": i})
+            writes.flush()
+            assert m.get("sessions", "s19") == {"n": 19}
+            assert len(m.keys("sessions")) == 20
+            # later writes to one key win, even across batches
+            assert other.get("sessions", "last") == {"n": 19}
+        finally:
+            writes.close()
+            m.close()
+            other.close()
+    assert writes._thread is None
+
+
+def test_memory_write_queue_blocks_instead_of_overtaking_when_full():
+    with tempfile.TemporaryDirectory() as td:
+        m = MemoryBank(db_path=os.path.join(td, "mem.db"))
+        writes = MemoryWriteQueue(maxsize=1, batch_size=1)
+        try:
+            for i in range(10):
+                writes.submit(m, "sessions", "s1", {"n": i})
+            writes.flush()
+            assert m.get("sessions", "s1") == {"n": 9}
+        finally:
+            writes.close()
+            m.close()
+
+
+def test_memory_close_commits_shared_queued_writes():
+    with tempfile.TemporaryDirectory() as td:
+        path = os.path.join(td, "mem.db")
+        m = MemoryBank(db_path=path)
+        for i in range(50):
+            shared_write_queue().submit(m, "sessions", f"s{i}", {"n": i})
+        m.close()
+        reopened = MemoryBank(db_path=path)
+        try:
+            assert len(reopened.keys("sessions")) == 50
+        finally:
+            reopened.close()
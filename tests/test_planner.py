@@ -122,3 +122,15 @@ def test_planner_emits_tool_calls():
         except Exception:
             pass
         os.remove(path)
+
+
+def test_planner_resumes_checkpoint_saved_by_another_instance():
+    with tempfile.TemporaryDirectory() as td:
+        mem = MemoryBank(db_path=os.path.join(td, "mem.db"))
+        try:
+            planner, other = PlannerAgent(memory=mem), PlannerAgent(memory=mem)
+            env = {"payload": {"user_id": "u1", "text": "Create a plan"}}
+            assert other.handle(env)["status"] == "completed"
+            assert planner.handle(env)["status"] == "resumed"
+        finally:
+            mem.close()
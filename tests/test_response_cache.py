@@ -0,0 +1,49 @@
+import os
+import tempfile
+
+from smart_buddy.memory import MemoryBank
+from smart_buddy.response_cache import ResponseCache, prompt_key
+
+
+class _CountingLLM:
+    def __init__(self, content):
+        self.content = content
+        self.calls = 0
+
+    def generate(self, prompt):
+        self.calls += 1
+        return {"candidates": [{"content": self.content}]}
+
+
+def test_prompt_key_ignores_case_and_whitespace():
+    assert prompt_key("Show  my\nTasks") == prompt_key("show my tasks")
+
+
+def test_generate_hits_memory_tier_after_restart():
+    with tempfile.TemporaryDirectory() as td:
+        mem = MemoryBank(os.path.join(td, "mem.db"))
+        llm = _CountingLLM(" hello there ")
+        assert ResponseCache(memory=mem).generate(llm, "Hi") == "hello there"
+        assert ResponseCache(memory=mem).generate(llm, "hi") == "hello there"
+        assert llm.calls == 1
+        mem.close()
+
+
+def test_stub_replies_are_not_cached():
+    llm = _CountingLLM("[stub reply] Hi")
+    cache = ResponseCache()
+    cache.generate(llm, "Hi")
+    cache.generate(llm, "Hi")
+    assert llm.calls == 2
+
+
+def test_generate_without_persist_stays_in_process():
+    with tempfile.TemporaryDirectory() as td:
+        mem = MemoryBank(os.path.join(td, "mem.db"))
+        cache = ResponseCache(memory=mem)
+        llm = _CountingLLM("hello")
+        assert cache.generate(llm, "history + hi", persist=False) == "hello"
+        assert cache.generate(llm, "history + hi", persist=False) == "hello"
+        assert llm.calls == 1
+        assert mem.keys("llm_cache") == []
+        mem.close()
@@ -92,3 +92,12 @@ def test_integration_router_memory_llm(monkeypatch):
         except Exception:
             pass
         os.remove(path)
+
+
+def test_router_without_memory_writes_no_db_file(monkeypatch):
+    with tempfile.TemporaryDirectory() as td:
+        monkeypatch.chdir(td)
+        router = RouterAgent()
+        result = router.planner.handle({"payload": {"user_id": "u1", "text": "Create a plan"}})
+        assert result["status"] == "completed"
+        assert os.listdir(td) == []
@@ -0,0 +1,11 @@
+import uuid
+
+from smart_buddy.trace_ids import new_trace_id
+
+
+def test_trace_ids_are_unique_uuid4_strings():
+    ids = [new_trace_id() for _ in range(1000)]
+    assert len(set(ids)) == len(ids)
+    for trace_id in ids[:300]:
+        parsed = uuid.UUID(trace_id)
+        assert parsed.version == 4 and str(parsed) == trace_id